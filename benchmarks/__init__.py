@@ -0,0 +1,4 @@
+"""
+Benchmarks of the generation hot paths, each module can be executed directly, for example:
+`python -m benchmarks.render`
+"""
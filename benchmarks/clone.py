@@ -0,0 +1,148 @@
+"""
+Compares stamping out methods by `Structure.clone` with `copy.deepcopy` of a prototype
+and with building each method from scratch, the methods differ by their names and return
+types. It shows the time of each way and the memory that the methods keep and allocate,
+traced by tracemalloc in a separate run.
+
+The classes are clones of a prototype with a lazily inserted method, which every clone
+shares, so cloning them shows the cost of registering many parents of a block.
+"""
+import copy
+import gc
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple
+
+from benchmarks.utils import measure, print_table
+from codemate import Block, Class, Method
+
+CLONES = 100_000
+
+
+def build_method(name: str = "get_resource", return_value: str = "Resource") -> Method:
+    """
+    Builds a decorated method that sends a request and parses the response.
+
+    Args:
+        name (str): The name of the method.
+        return_value (str): The type of the method return value.
+
+    Returns:
+        Method: The method.
+    """
+    method = Method(name, arguments=("item_id: str",), return_value=return_value)
+    method.add_decorator("timer")
+    method.add_doc_line("Sends the request of the operation.")
+    method.add_syntax_block(
+        """
+        response = self._session.request(self._method, self._url, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+        """
+    )
+    return method
+
+
+def clone_methods(count: int) -> List[Method]:
+    """
+    Args:
+        count (int): How many methods to stamp out.
+
+    Returns:
+        List[Method]: The clones of a prototype.
+    """
+    prototype = build_method()
+    return [
+        prototype.clone(name=f"get_{index}", return_value=f"Resource{index}")
+        for index in range(count)
+    ]
+
+
+def clone_classes(count: int) -> List[Class]:
+    """
+    Args:
+        count (int): How many classes to stamp out.
+
+    Returns:
+        List[Class]: The clones of a prototype class that holds a lazily inserted
+            method, the method is shared by the clones.
+    """
+    prototype = Class("Client", inherit=("BaseClient",))
+    prototype.insert(build_method(), lazy=True)
+    return [prototype.clone(name=f"Client{index}") for index in range(count)]
+
+
+def deepcopy_methods(count: int) -> List[Method]:
+    """
+    Args:
+        count (int): How many methods to stamp out.
+
+    Returns:
+        List[Method]: The deep copies of a prototype, with their names and return types
+            changed.
+    """
+    prototype = build_method()
+    methods = []
+    for index in range(count):
+        method = copy.deepcopy(prototype)
+        # pylint: disable=protected-access
+        method._name = f"get_{index}"
+        method._return_value = f"Resource{index}"
+        methods.append(method)
+    return methods
+
+
+def build_methods(count: int) -> List[Method]:
+    """
+    Args:
+        count (int): How many methods to build.
+
+    Returns:
+        List[Method]: The methods, each built from scratch.
+    """
+    return [build_method(f"get_{index}", f"Resource{index}") for index in range(count)]
+
+
+def measure_memory(
+    func: Callable[[int], Sequence[Block]], count: int
+) -> Tuple[int, int]:
+    """
+    Args:
+        func (Callable[[int], Sequence[Block]]): Stamps out the structures.
+        count (int): How many methods to stamp out.
+
+    Returns:
+        Tuple[int, int]: The bytes that the methods keep and the peak of the memory
+            that stamping them out allocated.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        methods = func(count)
+        gc.collect()
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del methods
+    return kept, peak
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    rows = []
+    functions: Tuple[Callable[[int], Sequence[Block]], ...] = (
+        clone_methods,
+        deepcopy_methods,
+        build_methods,
+        clone_classes,
+    )
+    for func in functions:
+        seconds = measure(lambda func=func: func(CLONES), repeat=1)  # type: ignore
+        kept, peak = measure_memory(func, CLONES)
+        rows.append((func.__name__, seconds, kept // CLONES, peak // CLONES))
+    print_table(("stamped out by", "seconds", "bytes each", "peak each"), rows)
+
+
+if __name__ == "__main__":
+    main()
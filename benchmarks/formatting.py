@@ -0,0 +1,93 @@
+"""
+Shows the speedup of formatting a single big file by Black in parallel, against the
+file size and the number of top-level structures. The speedup is bounded by the number
+of cores, and by the biggest structure since a structure is never split.
+"""
+import os
+from functools import partial
+from typing import List, Sequence
+
+from benchmarks.utils import measure, print_table
+from codemate import Class, File, Method, formatter
+
+JOBS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+
+def build_file(structures: int, methods: int) -> File:
+    """
+    Builds a file of classes, each class holds the given amount of methods.
+
+    Args:
+        structures (int): How many classes the file holds.
+        methods (int): How many methods each class holds.
+
+    Returns:
+        File: The generated file.
+    """
+    file = File(header="Benchmark")
+    for index in range(structures):
+        class_ = Class(f"Client{index}")
+        for method_index in range(methods):
+            method = Method(f"get_{method_index}", arguments=("item_id:str",))
+            method.add_syntax_lines(
+                "response = self._session.get(f'/items/{item_id}',timeout = 10)",
+                "return {'id':item_id,'status':response.status_code}",
+            )
+            class_.insert(method)
+        file.insert(class_)
+    return file
+
+
+def format_file(file: File, jobs: int) -> str:
+    """
+    Formats a file without the formatting cache.
+
+    Args:
+        file (File): The file that we want to format.
+        jobs (int): How many processes format the file.
+
+    Returns:
+        str: The formatted syntax.
+    """
+    formatter.disable_cache()
+    return formatter.format_module(file.syntax(), jobs=jobs)
+
+
+def measure_speedups(file: File, jobs: Sequence[int]) -> List[float]:
+    """
+    Measures the formatting time of a file by the amount of processes.
+
+    Args:
+        file (File): The file that we want to format.
+        jobs (Sequence[int]): The amounts of processes to measure.
+
+    Returns:
+        List[float]: The serial time followed by the speedup of each amount.
+    """
+    serial = measure(partial(format_file, file, 1), repeat=1)
+    speedups = [serial / measure(partial(format_file, file, n), repeat=1) for n in jobs]
+    return [serial] + speedups
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    headers = ("classes", "bytes", "serial seconds") + tuple(f"x{n}" for n in JOBS)
+    # The file grows with the number of classes
+    rows = []
+    for structures in (8, 16, 32, 64):
+        file = build_file(structures, methods=20)
+        rows.append((structures, len(file.syntax()), *measure_speedups(file, JOBS)))
+    print_table(headers, rows)
+    print()
+    # The same methods are spread across a growing number of classes
+    rows = []
+    for structures in (1, 4, 16, 64, 256):
+        file = build_file(structures, methods=1280 // structures)
+        rows.append((structures, len(file.syntax()), *measure_speedups(file, JOBS)))
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
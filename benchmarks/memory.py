@@ -0,0 +1,77 @@
+"""
+Shows how much memory the generated structures keep, in bytes per generated method of
+the synthetic OpenAPI clients of `benchmarks.suite`, traced by tracemalloc. The bytes
+per method should stay roughly constant as the clients grow.
+
+Each client is also built with interning enabled, to show the memory it saves and the
+deduplication ratio of the interned strings.
+"""
+import gc
+import tracemalloc
+from typing import Tuple
+
+from benchmarks.suite import build_client
+from benchmarks.utils import print_table
+from codemate import interning
+
+
+def measure_client(operations: int) -> Tuple[int, int]:
+    """
+    Measures the memory of building a client, and of keeping it.
+
+    Args:
+        operations (int): How many methods the client holds.
+
+    Returns:
+        Tuple[int, int]: The bytes that the built client keeps and the peak of the
+            memory that building it allocated.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        client = build_client(operations)
+        gc.collect()
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del client
+    return kept, peak
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    rows = []
+    for operations in (1_000, 10_000, 100_000):
+        kept, peak = measure_client(operations)
+        interning.enable_interning()
+        try:
+            interned, _ = measure_client(operations)
+            info = interning.interning_info()
+        finally:
+            interning.disable_interning()
+        assert info is not None
+        rows.append(
+            (
+                operations,
+                kept,
+                peak,
+                kept // operations,
+                interned // operations,
+                f"{info.ratio:.1f}x",
+            )
+        )
+    headers = (
+        "methods",
+        "kept bytes",
+        "peak bytes",
+        "bytes/method",
+        "interned/method",
+        "dedup ratio",
+    )
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares saving a generated package by Package.save with a serial loop over File.save.
+The files are validated and formatted in processes, the speedup is bounded by the number
+of cores.
+"""
+import os
+import tempfile
+from functools import partial
+
+from benchmarks.formatting import JOBS, build_file
+from benchmarks.utils import measure, print_table
+from codemate import Package, formatter
+
+
+def build_package(modules: int) -> Package:
+    """
+    Builds a package of modules, each module holds a few classes.
+
+    Args:
+        modules (int): How many modules the package holds.
+
+    Returns:
+        Package: The generated package.
+    """
+    package = Package()
+    for index in range(modules):
+        package.add_file(f"api/module_{index}.py", build_file(structures=4, methods=5))
+    return package
+
+
+def save_serially(package: Package, root: str) -> None:
+    """
+    Saves the files of a package one by one by File.save.
+
+    Args:
+        package (Package): The package that we want to save.
+        root (str): The package directory.
+    """
+    for path, file in package.files.items():
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file.save(path)
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    formatter.disable_cache()
+    rows = []
+    with tempfile.TemporaryDirectory() as root:
+        for modules in (25, 50, 100, 200):
+            package = build_package(modules)
+            serial = measure(partial(save_serially, package, root), repeat=1)
+            speedups = (
+                serial / measure(partial(package.save, root, jobs=jobs), repeat=1)
+                for jobs in JOBS
+            )
+            rows.append((modules, serial, *speedups))
+    print_table(("modules", "File.save loop") + tuple(f"x{n}" for n in JOBS), rows)
+
+
+if __name__ == "__main__":
+    main()
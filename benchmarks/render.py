@@ -0,0 +1,141 @@
+"""
+Shows that the syntax rendering scales linearly with the nesting depth and with the
+number of lines. The time per generated byte shouldn't grow in the tables, deep lines
+carry a longer indentation so the output grows faster than the lines.
+
+The nested blocks are timed from building to rendering, since an eagerly inserted block
+is rendered when it's inserted. Only lazily inserted blocks are rendered in a single
+pass across the levels, an eagerly inserted line is indented again by each level.
+"""
+import time
+from functools import partial
+from typing import List, Sequence, Tuple
+
+from benchmarks.utils import measure, print_table
+from codemate import Block, Class, Function, Method
+
+LINES_PER_LEVEL = 50
+
+
+def build_nested(depth: int, lines: int = LINES_PER_LEVEL, lazy: bool = True) -> Block:
+    """
+    Builds a chain of nested functions, each level holds the given amount of lines.
+
+    Args:
+        depth (int): How many functions to nest.
+        lines (int): How many lines to add in each level.
+        lazy (bool): Whether each function is inserted lazily into the next one.
+
+    Returns:
+        Block: The outer block of the chain.
+    """
+    inner: Block = Block()
+    inner.add_syntax_lines(*(f"x_{i} = {i}" for i in range(lines)))
+    for level in range(depth):
+        function = Function(f"level_{level}", arguments=("x",))
+        function.add_syntax_lines(*(f"y_{i} = x + {i}" for i in range(lines)))
+        function.insert(inner, lazy=lazy)
+        inner = function
+    return inner
+
+
+def measure_lazy(
+    methods: int, lines: int = LINES_PER_LEVEL
+) -> Tuple[int, float, float]:
+    """
+    Measures the rendering of a lazily built class, before and after a change of one of
+    its methods.
+
+    Args:
+        methods (int): How many methods the class holds.
+        lines (int): How many lines each method holds.
+
+    Returns:
+        Tuple[int, float, float]: The syntax size, the first rendering time and the
+            rendering time after the change.
+    """
+    class_ = Class("Client")
+    changed = Method("changed")
+    for index in range(methods):
+        method = Method(f"method_{index}") if index else changed
+        method.add_syntax_lines(*(f"y_{i} = {i}" for i in range(lines)))
+        class_.insert(method, lazy=True)
+    start = time.perf_counter()
+    size = len(class_.syntax())
+    cold = time.perf_counter() - start
+    changed.add_syntax_line("changed = True")
+    start = time.perf_counter()
+    class_.syntax()
+    return size, cold, time.perf_counter() - start
+
+
+def build_and_render(depth: int, lazy: bool) -> str:
+    """
+    Args:
+        depth (int): How many functions to nest.
+        lazy (bool): Whether each function is inserted lazily into the next one.
+
+    Returns:
+        str: The syntax of a chain of nested functions that was built for it.
+    """
+    return build_nested(depth, lazy=lazy).syntax()
+
+
+def render(block: Block) -> str:
+    """
+    Renders a block without using its memoized syntax.
+
+    Args:
+        block (Block): The block that we want to render.
+
+    Returns:
+        str: The block syntax.
+    """
+    block._invalidate()  # pylint: disable=protected-access
+    return block.syntax()
+
+
+def build_flat(lines: int) -> Block:
+    """
+    Builds a block with a given amount of lines.
+
+    Args:
+        lines (int): How many lines to add.
+
+    Returns:
+        Block: The generated block.
+    """
+    block = Block()
+    block.add_syntax_lines(*(f"x_{i} = {i}" for i in range(lines)))
+    return block
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    rows: List[Sequence[object]] = []
+    for depth in (10, 20, 40, 80, 160):
+        size = len(build_and_render(depth, lazy=True))
+        lazy = measure(partial(build_and_render, depth, lazy=True))
+        eager = measure(partial(build_and_render, depth, lazy=False))
+        rows.append((depth, size, lazy, lazy / size * 1e9, eager / size * 1e9))
+    print_table(("depth", "bytes", "seconds", "ns/byte", "eager ns/byte"), rows)
+    print()
+    rows = []
+    for methods in (100, 200, 400, 800, 1600):
+        size, cold, changed = measure_lazy(methods)
+        rows.append((methods, size, cold, cold / size * 1e9, changed))
+    print_table(("lazy methods", "bytes", "seconds", "ns/byte", "after change"), rows)
+    print()
+    rows = []
+    for lines in (10_000, 20_000, 40_000, 80_000, 160_000):
+        block = build_flat(lines)
+        size = len(block.syntax())
+        seconds = measure(partial(render, block))
+        rows.append((lines, size, seconds, seconds / size * 1e9))
+    print_table(("lines", "bytes", "seconds", "ns/byte"), rows)
+
+
+if __name__ == "__main__":
+    main()
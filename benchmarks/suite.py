@@ -0,0 +1,343 @@
+"""
+A suite of scenarios of the generation hot paths. Each scenario reports its best time
+and its peak memory, traced by tracemalloc in a separate run, and the results are
+compared with a stored baseline:
+
+`python -m benchmarks.suite` fails when a scenario regressed past the baseline.
+
+`python -m benchmarks.suite --save-baseline` stores the results as the baseline, run it
+on the machine that runs the comparisons.
+
+`python -m benchmarks.suite -k openapi` runs the scenarios whose names contain "openapi".
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from benchmarks.clone import clone_methods
+from benchmarks.formatting import build_file
+from benchmarks.render import build_nested
+from benchmarks.utils import measure, print_table
+from codemate import Block, Class, File, Function, Method, formatter, validator
+from codemate.block import IMPORTS_CACHE
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# How much slower or bigger than the baseline a scenario may be, as a fraction
+TIME_TOLERANCE = 1.0
+MEMORY_TOLERANCE = 0.2
+
+# The HTTP methods of the operations of the synthetic OpenAPI clients
+HTTP_METHODS = ("get", "post", "put", "delete")
+
+
+class Scenario(NamedTuple):
+    """
+    A measured scenario.
+
+    Attributes:
+        name (str): The name of the scenario.
+        setup (Callable[[], Callable[[], object]]): Prepares the scenario and returns the
+            measured function, the function may be executed several times.
+        repeat (int): How many times the function is timed.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    repeat: int = 3
+
+
+class Result(NamedTuple):
+    """
+    The measurements of a scenario.
+
+    Attributes:
+        seconds (float): The best execution time.
+        peak (int): The peak of the memory that was allocated while executing, in bytes.
+    """
+
+    seconds: float
+    peak: int
+
+
+def build_client(operations: int, per_class: int = 50) -> File:
+    """
+    Builds a synthetic client of an OpenAPI specification, in the spirit of the README
+    example. The operations are grouped into classes by their tags, each operation is
+    a decorated method that sends a request and parses the response.
+
+    Args:
+        operations (int): How many operations the specification holds.
+        per_class (int): How many operations each tag holds.
+
+    Returns:
+        File: The generated client.
+    """
+    file = File(header="OpenAPI client", fingerprint="benchmark")
+    file.add_specific_import("typing", "Any", "Dict", "Optional")
+    file.add_variable("TIMEOUT", type="int", value="10")
+    for first in range(0, operations, per_class):
+        class_ = Class(f"Tag{first // per_class}Client", inherit=("BaseClient",))
+        class_.add_doc_line(f"The operations of tag {first // per_class}.")
+        class_.add_specific_import("client.base", "BaseClient")
+        class_.add_specific_import("client.utils", "timer")
+        for index in range(first, min(first + per_class, operations)):
+            http_method = HTTP_METHODS[index % len(HTTP_METHODS)]
+            method = Method(
+                f"{http_method}_resource_{index}",
+                arguments=("item_id: str", "body: Optional[Dict[str, Any]] = None"),
+                return_value="Dict[str, Any]",
+            )
+            method.add_decorator("timer")
+            method.add_doc_line(f"{http_method.upper()} /resources/{index}/{{item_id}}")
+            method.add_syntax_block(
+                f"""
+                response = self._session.{http_method}(
+                    f"/resources/{index}/{{item_id}}", json=body, timeout=TIMEOUT
+                )
+                response.raise_for_status()
+                return response.json()
+                """
+            )
+            class_.insert(method, lazy=True)
+        file.insert(class_, lazy=True)
+    return file
+
+
+def _uncached(block: Block, func: Callable[[], object]) -> object:
+    # The memoized syntax of the block is dropped, so it is rendered again
+    block._invalidate()  # pylint: disable=protected-access
+    return func()
+
+
+def _build_classes(classes: int, methods: int) -> Callable[[], object]:
+    return lambda: build_file(classes, methods).syntax()
+
+
+def _build_nesting(depth: int) -> Callable[[], object]:
+    return lambda: build_nested(depth).syntax()
+
+
+def _add_syntax_block(lines: int) -> Callable[[], object]:
+    syntax = "\n".join(
+        f"    value_{index} = compute({index})" for index in range(lines)
+    )
+    return lambda: Block().add_syntax_block(syntax).syntax()
+
+
+def _format_imports(imports: int, sorter: str) -> Callable[[], object]:
+    block = Block()
+    block.set_import_sorter(sorter)
+    for index in range(imports):
+        block.add_specific_import(f"package_{index % 50}.module", f"Name{index}")
+        block.add_import(f"module_{index}")
+
+    def format_imports() -> str:
+        IMPORTS_CACHE.clear()
+        return block._format_imports(0)  # pylint: disable=protected-access
+
+    return format_imports
+
+
+def _validate(classes: int) -> Callable[[], object]:
+    file = build_file(classes, methods=20)
+
+    def validate() -> bool:
+        file._invalidate()  # pylint: disable=protected-access
+        validator.PARTS_CACHE.clear()
+        return file.validate()
+
+    return validate
+
+
+def _use_black(classes: int) -> Callable[[], object]:
+    file = build_file(classes, methods=10)
+    formatter.disable_cache()
+    return partial(_uncached, file, file.use_black)
+
+
+def _save_file(classes: int, use_black: bool) -> Callable[[], object]:
+    file = build_file(classes, methods=10)
+    formatter.disable_cache()
+    # The directory is removed when the function is collected at the end of the run
+    directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    path = os.path.join(directory.name, "generated.py")
+    save = partial(file.save, path, use_black=use_black)
+    return lambda: (_uncached(file, save), directory)
+
+
+def _build_client(operations: int) -> Callable[[], object]:
+    return lambda: build_client(operations).syntax()
+
+
+def _check_definitions(functions: int) -> Callable[[], object]:
+    def check_definitions() -> File:
+        # A generator that skips the functions that the file already defines
+        file = File(header=None)
+        for index in range(functions):
+            if f"def function_{index}(" not in file:
+                function = Function(f"function_{index}", arguments=("value",))
+                function.add_syntax_line("return value")
+                file.insert(function, lazy=True)
+        return file
+
+    return check_definitions
+
+
+SCENARIOS = (
+    Scenario("classes_100x20", partial(_build_classes, 100, 20)),
+    Scenario("nesting_160", partial(_build_nesting, 160)),
+    Scenario("syntax_block_20k", partial(_add_syntax_block, 20_000)),
+    Scenario("imports_isort", partial(_format_imports, 500, "isort")),
+    Scenario("imports_native", partial(_format_imports, 500, "native")),
+    Scenario("validate_100x20", partial(_validate, 100)),
+    Scenario("black_20x10", partial(_use_black, 20), repeat=1),
+    Scenario("save_20x10", partial(_save_file, 20, True), repeat=1),
+    Scenario("save_raw_100x10", partial(_save_file, 100, False)),
+    Scenario("openapi_1k", partial(_build_client, 1_000)),
+    Scenario("openapi_10k", partial(_build_client, 10_000), repeat=1),
+    Scenario("openapi_100k", partial(_build_client, 100_000), repeat=1),
+    Scenario("contains_4k", partial(_check_definitions, 4_000)),
+    Scenario("clone_100k", lambda: partial(clone_methods, 100_000), repeat=1),
+)
+
+
+def run_scenario(scenario: Scenario) -> Result:
+    """
+    Measures a scenario, the memory is traced in a separate run so the tracing doesn't
+    affect the time.
+
+    Args:
+        scenario (Scenario): The scenario that we want to measure.
+
+    Returns:
+        Result: The measurements of the scenario.
+    """
+    func = scenario.setup()
+    seconds = measure(func, repeat=scenario.repeat)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(seconds, peak)
+
+
+def find_regressions(
+    results: Dict[str, Result],
+    baseline: Dict[str, Result],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> List[str]:
+    """
+    Compares the results of the scenarios with their baseline, the scenarios without a
+    baseline are skipped.
+
+    Args:
+        results (Dict[str, Result]): The results by the names of the scenarios.
+        baseline (Dict[str, Result]): The baseline results by the names of the
+            scenarios.
+        time_tolerance (float): How much slower than the baseline a scenario may be.
+        memory_tolerance (float): How much more memory than the baseline a scenario may
+            allocate.
+
+    Returns:
+        List[str]: The descriptions of the regressions.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result.seconds > base.seconds * (1 + time_tolerance):
+            regressions.append(
+                f"{name}: {result.seconds:.6f} seconds, "
+                f"the baseline is {base.seconds:.6f} seconds"
+            )
+        if result.peak > base.peak * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: {result.peak} bytes, the baseline is {base.peak} bytes"
+            )
+    return regressions
+
+
+def load_baseline(path: str = BASELINE) -> Dict[str, Result]:
+    """
+    Args:
+        path (str): The path of the baseline file.
+
+    Returns:
+        Dict[str, Result]: The baseline results by the names of the scenarios, empty
+            when the baseline file doesn't exist.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+    except FileNotFoundError:
+        return {}
+    return {name: Result(**result) for name, result in content.items()}
+
+
+def save_baseline(results: Dict[str, Result], path: str = BASELINE) -> None:
+    """
+    Stores results as the baseline, the baseline of the scenarios that didn't run is
+    kept.
+
+    Args:
+        results (Dict[str, Result]): The results by the names of the scenarios.
+        path (str): The path of the baseline file.
+    """
+    baseline = {**load_baseline(path), **results}
+    content = {name: result._asdict() for name, result in sorted(baseline.items())}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=4)
+        file.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Executes the suite, prints the results and compares them with the baseline.
+
+    Args:
+        argv (Optional[Sequence[str]]): The command line arguments.
+
+    Returns:
+        int: The exit code, 1 when a scenario regressed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("-k", "--keyword", default="", help="Filters the scenarios.")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+    baseline = load_baseline(args.baseline)
+    results = {}
+    rows = []
+    for scenario in SCENARIOS:
+        if args.keyword not in scenario.name:
+            continue
+        result = results[scenario.name] = run_scenario(scenario)
+        base = baseline.get(scenario.name)
+        ratio = f"{result.seconds / base.seconds:.2f}" if base else "-"
+        rows.append((scenario.name, result.seconds, result.peak / 2 ** 20, ratio))
+    print_table(("scenario", "seconds", "peak MiB", "x baseline"), rows)
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+    regressions = find_regressions(
+        results, baseline, args.time_tolerance, args.memory_tolerance
+    )
+    for regression in regressions:
+        print(f"Regression - {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
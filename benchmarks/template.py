@@ -0,0 +1,130 @@
+"""
+Compares generating the synthetic OpenAPI clients of `benchmarks.suite` from a compiled
+template with building each method, the clients have the same syntax. It shows the time
+of building and of streaming each client, the streamed megabytes per second and the
+memory that the client keeps per method, traced by tracemalloc in a separate run.
+"""
+import gc
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from benchmarks.suite import HTTP_METHODS, build_client
+from benchmarks.utils import print_table
+from codemate import Class, File, Method, Template
+
+
+def build_template() -> Template:
+    """
+    Returns:
+        Template: The template of the methods of the client, the HTTP method and the
+            index of the operation are its placeholders.
+    """
+    method = Method(
+        "${method}_resource_$index",
+        arguments=("item_id: str", "body: Optional[Dict[str, Any]] = None"),
+        return_value="Dict[str, Any]",
+    )
+    method.add_decorator("timer")
+    method.add_doc_line("$upper /resources/$index/{item_id}")
+    method.add_syntax_block(
+        """
+        response = self._session.$method(
+            f"/resources/$index/{item_id}", json=body, timeout=TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+        """
+    )
+    return Template(method)
+
+
+def build_template_client(operations: int, per_class: int = 50) -> File:
+    """
+    Builds the client of `benchmarks.suite.build_client` from a template.
+
+    Args:
+        operations (int): How many operations the specification holds.
+        per_class (int): How many operations each tag holds.
+
+    Returns:
+        File: The generated client.
+    """
+    template = build_template()
+    file = File(header="OpenAPI client", fingerprint="benchmark")
+    file.add_specific_import("typing", "Any", "Dict", "Optional")
+    file.add_variable("TIMEOUT", type="int", value="10")
+    for first in range(0, operations, per_class):
+        class_ = Class(f"Tag{first // per_class}Client", inherit=("BaseClient",))
+        class_.add_doc_line(f"The operations of tag {first // per_class}.")
+        class_.add_specific_import("client.base", "BaseClient")
+        class_.add_specific_import("client.utils", "timer")
+        for index in range(first, min(first + per_class, operations)):
+            http_method = HTTP_METHODS[index % len(HTTP_METHODS)]
+            method = template.instantiate(
+                method=http_method, upper=http_method.upper(), index=str(index)
+            )
+            class_.insert(method, lazy=True)
+        file.insert(class_, lazy=True)
+    return file
+
+
+def measure_client(
+    build: Callable[[int], File], operations: int
+) -> Tuple[float, float, int, int]:
+    """
+    Args:
+        build (Callable[[int], File]): Builds a client.
+        operations (int): How many methods the client holds.
+
+    Returns:
+        Tuple[float, float, int, int]: The seconds of building and of streaming the
+            client, the size of its syntax and the bytes that the client keeps.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    client = build(operations)
+    built = time.perf_counter()
+    size = sum(map(len, client.iter_syntax()))
+    streamed = time.perf_counter()
+    del client
+    gc.collect()
+    tracemalloc.start()
+    try:
+        client = build(operations)
+        gc.collect()
+        kept, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del client
+    return built - start, streamed - built, size, kept
+
+
+def main() -> None:
+    """
+    Executes the benchmark and prints the results.
+    """
+    assert build_template_client(100).syntax() == build_client(100).syntax()
+    rows = []
+    for name, build, operations in (
+        ("methods", build_client, 100_000),
+        ("template", build_template_client, 100_000),
+        ("template", build_template_client, 1_000_000),
+    ):
+        build_seconds, stream_seconds, size, kept = measure_client(build, operations)
+        rows.append(
+            (
+                name,
+                operations,
+                build_seconds,
+                stream_seconds,
+                f"{size / 2 ** 20 / stream_seconds:.1f}",
+                kept // operations,
+            )
+        )
+    headers = ("built by", "methods", "build", "stream", "MiB/s", "bytes/method")
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
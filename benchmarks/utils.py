@@ -0,0 +1,37 @@
+import time
+from typing import Callable, Iterable, Sequence
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> float:
+    """
+    Measures the execution time of a given function.
+
+    Args:
+        func (Callable[[], object]): The function that we want to measure.
+        repeat (int): How many times to execute the function.
+
+    Returns:
+        float: The best execution time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    """
+    Prints the benchmark results as an aligned table.
+
+    Args:
+        headers (Sequence[str]): The names of the columns.
+        rows (Iterable[Sequence[object]]): The values of the rows.
+    """
+    print("".join(header.rjust(16) for header in headers))
+    for row in rows:
+        cells = (
+            f"{cell:.6f}" if isinstance(cell, float) else str(cell) for cell in row
+        )
+        print("".join(cell.rjust(16) for cell in cells))
@@ -5,6 +5,8 @@ Python syntax generator based on Object-Oriented Programing, type hints, and sim
 from codemate.block import Block
 from codemate.file import File
 from codemate.method import ClassMethod, Method, StaticMethod
+from codemate.package import Package
 from codemate.structure import Class, Function
+from codemate.template import Template, TemplateInstance
 
 __version__ = "0.3.0"
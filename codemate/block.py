@@ -1,16 +1,101 @@
-import re
+# pylint: disable=too-many-lines
+import ast
+import hashlib
+import weakref
 from functools import partial
-from typing import List, Set
-
-import black
-import isort
+from typing import (
+    AbstractSet,
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from codemate import validator
-from codemate.exceptions import InputError, PythonSyntaxError
+from codemate.cache import LRUCache
+from codemate.exceptions import PythonSyntaxError
+from codemate.imports import sort_imports
+from codemate.index import ContentIndex
+from codemate.interning import intern
+from codemate.pipeline import Pipeline
+from codemate.renderer import Renderer
 from codemate.utils import remove_indentation
 
+# How many rendered lines are collected before a chunk is yielded by Block.iter_syntax
+BUFFER_SIZE = 4096
+
+# The sorted imports, by the imports lines, their indentation and the sorter.
+# Shared by all the blocks, use IMPORTS_CACHE.info() to get its statistics.
+IMPORTS_CACHE: LRUCache[str] = LRUCache(maxsize=1024)
+
+# The backends that can sort the imports of a block
+IMPORT_SORTERS = ("isort", "native")
+
+# The imports of the blocks that have none, shared since most blocks have none
+_NO_IMPORTS: FrozenSet[str] = frozenset()
+
+# The indentations by their sizes, shared by the blocks
+_INDENTATIONS: Dict[int, str] = {}
+
+# Attributes that are derived from the block content and are not part of its state
+_RUNTIME_ATTRIBUTES = ("_cache", "_parents", "_index", "__weakref__")
+
+_Block = TypeVar("_Block", bound="Block")
+
+# The slots that hold the state of the blocks by their types
+_STATE_SLOTS: Dict[type, Tuple[str, ...]] = {}
+
+# The key of the content hash in the rendered results of a block
+_HASH_KEY = ("hash",)
+
+
+def _state_slots(class_: type) -> Tuple[str, ...]:
+    slots = _STATE_SLOTS.get(class_)
+    if slots is None:
+        slots = _STATE_SLOTS[class_] = tuple(
+            name
+            for base in reversed(class_.__mro__)
+            for name in getattr(base, "__slots__", ())
+            if name not in _RUNTIME_ATTRIBUTES
+        )
+    return slots
+
+
+def _positions(value: Union[int, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """
+    Returns:
+        Tuple[int, ...]: The positions of the definitions of a structure name, the last
+            definition is the one that the name refers to.
+    """
+    return value if isinstance(value, tuple) else (value,)
+
+
+def _count(lines: Sequence[str], prefix: str) -> Optional[int]:
+    """
+    Returns:
+        Optional[int]: How many statements a part of a syntax has, None when it can't be
+            parsed on its own.
+    """
+    statements = validator.parse_part(lines, prefix)
+    return None if statements is None else len(statements)
+
+
+def _indentation(size: int) -> str:
+    indentation = _INDENTATIONS.get(size)
+    if indentation is None:
+        indentation = _INDENTATIONS[size] = size * " "
+    return indentation
 
-class Block:
+
+class Block:  # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """
      A generator of a Python block syntax.
 
@@ -41,6 +126,7 @@ class Block:
      * add_import
      * add_imports
      * add_specific_import
+     * set_import_sorter
 
      Methods for adding Python syntax:
 
@@ -54,8 +140,24 @@ class Block:
      Methods for getting the generated syntax:
 
      * syntax
+     * iter_syntax
+     * write_to
      * use_black
 
+     Methods for getting the syntax tree:
+
+     * tree
+
+     Methods for querying the block:
+
+     * content_hash
+     * has_structure
+     * get_structure
+     * replace_structure
+     * remove_structure
+     * in - for example `"def foo" in block`
+     * == - compares the content hashes of the blocks
+
      Other Methods:
 
      * validate
@@ -63,17 +165,63 @@ class Block:
 
     Args:
         indentation (int): Determines how many spaces are used in the syntax indentation.
+
+    Attributes:
+        import_sorter (str): The backend that sorts the imports, "isort" or "native".
+            Set it on the class to change the backend of all the blocks, and use
+            `set_import_sorter` to change the backend of a block.
     """
 
+    # The blocks are generated by the hundreds of thousands, so they keep their
+    # attributes in slots instead of a dict each
+    __slots__ = (
+        "_indentation",
+        "_docs",
+        "_imports",
+        "_lines",
+        "_names",
+        "_import_sorter",
+        "_cache",
+        "_parents",
+        "_index",
+        "__weakref__",
+    )
+
+    import_sorter = "isort"
+
     def __init__(
         self,
         indentation: int = 4,
     ) -> None:
-        self._indentation = indentation * " "
-
-        self._docs: List[str] = []
-        self._imports: Set[str] = set()
-        self._lines: List[str] = []
+        self._indentation = _indentation(indentation)
+
+        # The docs, imports and lines are frozen until they change, so the new blocks
+        # share the empty ones and the clones share the content of the block
+        self._docs: Sequence[str] = ()
+        # A set is created when the first import is added
+        self._imports: AbstractSet[str] = _NO_IMPORTS
+        # Syntax lines and blocks that were inserted lazily, None in the place of a
+        # removed structure, the last line is never None
+        self._lines: Sequence[Union[str, Block, None]] = ()
+        # The positions of the inserted structures in the lines by their names, created
+        # when the first structure is inserted. A redefined name, for example a property
+        # and its setter, holds a tuple of the positions of its definitions.
+        self._names: Optional[Dict[str, Union[int, Tuple[int, ...]]]] = None
+        self._import_sorter: Optional[str] = None
+
+        # Rendered results, cleared whenever the block changes:
+        # * (indent, imports) - The syntax of the block.
+        # * prefix - The fragment of the block when it is inserted lazily in other block.
+        # * None - The imports of the block, including the lazily inserted blocks.
+        # * ("statements", prefix, imports) - How many statements the parts of the
+        #   block syntax have, when they are parsed on their own.
+        # * ("hash",) - The content hash of the block.
+        self._cache: Dict[Any, Any] = {}
+        # The blocks that inserted this block lazily, by their ids
+        self._parents: Dict[int, "weakref.ReferenceType[Block]"] = {}
+        # The content of the block and of the lazily inserted blocks, built on the first
+        # membership query and updated when content is added
+        self._index: Optional[ContentIndex] = None
 
     def parse_block(self, block: str, new_line: int = 0, indent: int = 0) -> str:
         """
@@ -87,9 +235,11 @@ class Block:
         Returns:
             str: The parsed line.
         """
-        syntax = "\n" * new_line
-        syntax += re.sub("(^|\n)(.)", f"\\1{self._indentation * indent}\\2", block)
-        return syntax
+        prefix = self._indentation * indent
+        if prefix:
+            lines = block.split("\n")
+            block = "\n".join(prefix + line if line else line for line in lines)
+        return "\n" * new_line + block
 
     def add_doc_line(self, line: str, indent: int = 0) -> "Block":
         """
@@ -102,8 +252,12 @@ class Block:
         Returns:
             Block: The block instance.
         """
-        doc = self.parse_block(line, indent=indent)
+        doc = intern(self.parse_block(line, indent=indent))
+        if not isinstance(self._docs, list):
+            self._docs = list(self._docs)
         self._docs.append(doc)
+        self._update_index(lines=('"""', doc))
+        self._invalidate()
         return self
 
     def add_doc_lines(self, *lines: str, indent: int = 0) -> "Block":
@@ -146,7 +300,10 @@ class Block:
         Returns:
             Block: The block instance.
         """
-        self._imports.add(f"import {module}")
+        import_ = intern(f"import {module}")
+        self._add_imports((import_,))
+        self._update_index(imports=(import_,))
+        self._invalidate()
         return self
 
     def add_imports(self, *modules: str) -> "Block":
@@ -176,7 +333,30 @@ class Block:
             Block: The block instance.
         """
         if components:
-            self._imports.add(f"from {module} import {', '.join(components)}")
+            import_ = intern(f"from {module} import {', '.join(components)}")
+            self._add_imports((import_,))
+            self._update_index(imports=(import_,))
+            self._invalidate()
+        return self
+
+    def set_import_sorter(self, sorter: str) -> "Block":
+        """
+        Sets the backend that sorts the imports of the block.
+
+        Args:
+            sorter (str): "isort" to use isort, or "native" to use the built-in sorter
+                of `codemate.imports`, it falls back to isort for unsupported imports.
+
+        Returns:
+            Block: The block instance.
+
+        Raises:
+            ValueError: When the sorter is unknown.
+        """
+        if sorter not in IMPORT_SORTERS:
+            raise ValueError(f"Unknown import sorter {sorter!r}, use {IMPORT_SORTERS}")
+        self._import_sorter = sorter
+        self._invalidate()
         return self
 
     def add_syntax_line(self, line: str, indent: int = 0) -> "Block":
@@ -190,8 +370,11 @@ class Block:
         Returns:
              Block: The block instance.
         """
-        syntax = self.parse_block(line, indent=indent)
-        self._lines.append(syntax)
+        syntax = intern(self.parse_block(line, indent=indent))
+        self._own_lines().append(syntax)
+        if self._index is not None or self._parents:
+            self._update_index(lines=(syntax,))
+        self._invalidate()
         return self
 
     def add_syntax_lines(self, *lines: str, indent: int = 0) -> "Block":
@@ -249,48 +432,581 @@ class Block:
         self.add_syntax_line(syntax)
         return self
 
-    def extend(self, block: "Block") -> "Block":
+    def extend(self, block: "Block", unique: bool = False) -> "Block":
         """
         Adds other Python block syntax to the current Python block syntax.
         Ignoring the other's docs, copying the imports and adding the syntax.
 
         Args:
             block (Block): The block that we want to add.
+            unique (bool): Whether the structures of the other block may not redefine
+                the structures of this block.
 
         Returns:
             Block: The block instance.
+
+        Raises:
+            ValueError: When unique, and both blocks have structures with the same name.
         """
-        self._imports.update(block._imports)  # pylint: disable=protected-access
-        self._lines.extend(block._lines)  # pylint: disable=protected-access
+        # pylint: disable=protected-access
+        names = {
+            position: name
+            for name, value in (block._names or {}).items()
+            for position in _positions(value)
+        }
+        if unique:
+            for name in names.values():
+                self._check_name(name)
+        self._add_imports(block._imports)
+        lines = list(block._iter_lines())
+        for position, line in enumerate(list(block._lines)):
+            if line is None:
+                continue
+            if isinstance(line, Block):
+                line._attach(self)
+            self._add_line(line, names.get(position))
+        self._update_index(
+            lines=[line for line in lines if isinstance(line, str)],
+            imports=block._imports,
+            blocks=[line for line in lines if isinstance(line, Block)],
+        )
+        self._invalidate()
         return self
 
-    def insert(self, block: "Block") -> "Block":
+    def insert(
+        self, block: "Block", lazy: bool = False, unique: bool = False
+    ) -> "Block":
         """
         Inserts as is other Python block syntax to the current Python block syntax.
         Inserting the docs and syntax as is and copying the imports.
 
+        By default, the other block is rendered when it is inserted, later changes of
+        the other block are not part of this block. When lazy, a reference to the other
+        block is kept, it is rendered with this block and its imports are merged at that
+        time, so the blocks may be built in any order.
+
+        A structure may redefine a structure of the block with the same name, for
+        example the setter of a property, the name refers to the last definition.
+
         Args:
             block (Block): The block that we want to add.
+            lazy (bool): Whether to keep a reference to the block instead of its syntax.
+            unique (bool): Whether a structure may not redefine a structure of the
+                block.
+
+        Returns:
+            Block: The block instance.
+
+        Raises:
+            ValueError: When the block contains this block, or when unique, the block is
+                a structure and this block already has a structure with its name.
+        """
+        # pylint: disable=protected-access
+        name = block._structure_name()
+        if unique and name is not None:
+            self._check_name(name)
+        if lazy:
+            block._attach(self)
+            self._add_line(block, name)
+            self._update_index(blocks=(block,))
+        else:
+            syntax = block.syntax(imports=False)
+            # The imports of the blocks that were inserted into it lazily are copied too
+            imports = block._collect_imports()
+            self._add_imports(imports)
+            self._add_line(syntax, name)
+            self._update_index(lines=(syntax,), imports=imports)
+        self._invalidate()
+        return self
+
+    def _add_line(self, line: Union[str, "Block"], name: Optional[str] = None) -> None:
+        """
+        Args:
+            line (Union[str, Block]): A syntax line, or a lazily inserted block.
+            name (Optional[str]): The name of the structure that the line holds.
+        """
+        if name is not None:
+            if self._names is None:
+                self._names = {}
+            previous = self._names.get(name)
+            position = len(self._lines)
+            if previous is None:
+                self._names[name] = position
+            else:
+                self._names[name] = (*_positions(previous), position)
+        self._own_lines().append(line)
+
+    def _own_lines(self) -> List[Union[str, "Block", None]]:
+        """
+        Returns:
+            List[Union[str, Block, None]]: The lines of the block, copied when they are
+                shared with clones, so they can be changed.
+        """
+        lines = self._lines
+        if not isinstance(lines, list):
+            lines = self._lines = list(lines)
+        return lines
+
+    def _share(self) -> None:
+        """
+        Freezes the docs, imports and lines of the block, so its copies share them.
+        Frozen content is copied by the first change.
+        """
+        self._docs = tuple(self._docs)
+        self._lines = tuple(self._lines)
+        if isinstance(self._imports, set):
+            self._imports = frozenset(self._imports)
+
+    def _copy(self: _Block) -> _Block:
+        """
+        Returns:
+            Block: A copy of the block that shares its content until either of them
+                changes. The lazily inserted blocks are shared, as if they were
+                inserted into both blocks.
+        """
+        # pylint: disable=protected-access
+        self._share()
+        class_ = type(self)
+        clone = class_.__new__(class_)
+        for name in _state_slots(class_):
+            setattr(clone, name, getattr(self, name))
+        if hasattr(self, "__dict__"):
+            clone.__dict__.update(self.__dict__)
+        if self._names:
+            clone._names = dict(self._names)
+        clone._cache = {}
+        clone._parents = {}
+        clone._index = None
+        for line in self._lines:
+            if isinstance(line, Block):
+                line._attach(clone)
+        return clone
+
+    def _add_imports(self, imports: Collection[str]) -> None:
+        if imports:
+            if not isinstance(self._imports, set):
+                self._imports = set(self._imports)
+            self._imports.update(imports)
+
+    def _iter_lines(self) -> Iterator[Union[str, "Block"]]:
+        """
+        Yields:
+            Union[str, Block]: The syntax lines and the lazily inserted blocks, in the
+                order they are rendered.
+        """
+        for line in self._lines:
+            if line is not None:
+                yield line
+
+    def _position(self, name: str) -> int:
+        """
+        Returns:
+            int: The position of the last definition of a structure in the lines.
+
+        Raises:
+            KeyError: When the block has no structure with the given name.
+        """
+        return _positions((self._names or {})[name])[-1]
+
+    def _check_name(self, name: str) -> None:
+        """
+        Raises:
+            ValueError: When the block already has a structure with the given name.
+        """
+        if self._names and name in self._names:
+            raise ValueError(f"The block already has a structure named {name!r}")
+
+    def _attach(self, parent: "Block") -> None:
+        """
+        Registers a block that renders this block as part of its syntax.
+
+        Raises:
+            ValueError: When this block contains the parent block.
+        """
+        # pylint: disable=protected-access
+        if any(ancestor is self for ancestor in parent._iter_containers()):
+            raise ValueError("A block can't be inserted into itself")
+        self._add_parent(parent)
+
+    def _add_parent(self, parent: "Block") -> None:
+        """
+        Registers a parent block, a block that is inserted into many blocks registers
+        each of them in constant time.
+        """
+        reference = self._parents.get(id(parent))
+        # The id of a collected parent may be reused by a new block
+        if reference is None or reference() is not parent:
+            self._parents[id(parent)] = weakref.ref(parent)
+
+    def _iter_containers(self) -> Iterator["Block"]:
+        """
+        Yields:
+            Block: The block and the blocks that contain it.
+        """
+        pending = [self]
+        while pending:
+            block = pending.pop()
+            yield block
+            references = block._parents.values()  # pylint: disable=protected-access
+            pending.extend(filter(None, (reference() for reference in references)))
+
+    def _detach(self, parent: "Block") -> None:
+        """
+        Unregisters a block that no longer renders this block.
+        """
+        # Found by identity, equal blocks are different parents
+        reference = self._parents.get(id(parent))
+        if reference is not None and reference() is parent:
+            del self._parents[id(parent)]
+
+    def has_structure(self, name: str) -> bool:
+        """
+        Args:
+            name (str): The name of a function or a class.
+
+        Returns:
+            bool: True when the block has a structure with the given name, the
+                structures of the inserted blocks aren't included.
+        """
+        return self._names is not None and name in self._names
+
+    def get_structure(self, name: str) -> "Block":
+        """
+        Args:
+            name (str): The name of a function or a class.
+
+        Returns:
+            Block: The structure with the given name that was inserted lazily into the
+                block, the last definition when the name was redefined.
+
+        Raises:
+            KeyError: When the block has no structure with the given name, or when it
+                was inserted by its syntax, which is all the block keeps.
+        """
+        structure = self._lines[self._position(name)]
+        if not isinstance(structure, Block):
+            raise KeyError(f"The structure {name!r} was inserted by its syntax")
+        return structure
+
+    def replace_structure(self, structure: "Block", lazy: bool = False) -> "Block":
+        """
+        Replaces the structure that has the name of a given structure, the given
+        structure is rendered in its place. When the name was redefined, the last
+        definition is replaced. The imports of a structure that was
+        inserted by its syntax are kept.
+
+        Args:
+            structure (Block): The function or the class that we want to insert.
+            lazy (bool): Whether to keep a reference to the structure instead of its
+                syntax.
 
         Returns:
             Block: The block instance.
+
+        Raises:
+            KeyError: When the block has no structure with the name of the structure.
+            ValueError: When the structure contains this block, or isn't a function or
+                a class.
         """
-        self._imports.update(block._imports)  # pylint: disable=protected-access
-        self._lines.append(block.syntax(imports=False))
+        # pylint: disable=protected-access
+        name = structure._structure_name()
+        if name is None:
+            raise ValueError("Only a function or a class can replace a structure")
+        position = self._position(name)
+        lines = self._own_lines()
+        previous = lines[position]
+        if lazy:
+            structure._attach(self)
+            lines[position] = structure
+        else:
+            self._add_imports(structure._collect_imports())
+            lines[position] = structure.syntax(imports=False)
+        if isinstance(previous, Block) and previous is not lines[position]:
+            previous._detach(self)
+        self._reset_index()
+        self._invalidate()
         return self
 
-    def _format_docs(self, indent: int) -> str:
-        format_line = partial(self.parse_block, new_line=1, indent=indent)
-        syntax = self.parse_block('"""', indent=indent)
-        syntax += "".join(format_line(doc) for doc in self._docs)
-        syntax += format_line('"""')
-        syntax += "\n"
+    def remove_structure(self, name: str) -> "Block":
+        """
+        Removes a structure from the block. The imports of a structure that was inserted
+        by its syntax are kept. When the name was redefined, the last definition is
+        removed and the name refers to the previous one.
+
+        Args:
+            name (str): The name of the function or the class.
+
+        Returns:
+            Block: The block instance.
+
+        Raises:
+            KeyError: When the block has no structure with the given name.
+        """
+        position = self._position(name)
+        names = self._names or {}
+        previous = _positions(names[name])[:-1]
+        if not previous:
+            del names[name]
+        else:
+            names[name] = previous if len(previous) > 1 else previous[0]
+        lines = self._own_lines()
+        structure = lines[position]
+        # The positions of the other structures are kept
+        lines[position] = None
+        while lines and lines[-1] is None:
+            lines.pop()
+        if isinstance(structure, Block):
+            structure._detach(self)  # pylint: disable=protected-access
+        self._reset_index()
+        self._invalidate()
+        return self
+
+    def _structure_name(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: The name of the block when it's a structure, otherwise None.
+        """
+        return None
+
+    def _update_index(
+        self,
+        lines: Collection[str] = (),
+        imports: Collection[str] = (),
+        blocks: Collection["Block"] = (),
+    ) -> None:
+        """
+        Adds content to the membership indexes of the block and of the blocks that
+        contain it, the indexes that weren't built yet are skipped.
+
+        Args:
+            lines (Collection[str]): The added lines.
+            imports (Collection[str]): The added imports.
+            blocks (Collection[Block]): The lazily inserted blocks.
+        """
+        if self._index is None and not self._parents:
+            return
+        for block in self._iter_containers():
+            index = block._index  # pylint: disable=protected-access
+            if index is not None:
+                index.add(lines, imports)
+                for inserted in blocks:
+                    inserted._index_content(index)  # pylint: disable=protected-access
+
+    def _reset_index(self) -> None:
+        """
+        Drops the membership indexes of the block and of the blocks that contain it,
+        after content was removed. They are built again on the next query.
+        """
+        for block in self._iter_containers():
+            block._index = None  # pylint: disable=protected-access
+
+    def _index_content(self, index: ContentIndex) -> None:
+        """
+        Adds the content of the block and of the lazily inserted blocks to an index.
+        """
+        index.add(self._iter_index_lines(), self._imports)
+        for line in self._lines:
+            if isinstance(line, Block):
+                line._index_content(index)  # pylint: disable=protected-access
+
+    def _iter_index_lines(self) -> Iterator[str]:
+        """
+        Yields:
+            str: The rendered lines of the block without their indentation, excluding
+                the imports and the lazily inserted blocks.
+        """
+        if self._docs:
+            yield '"""'
+            yield from self._docs
+        for line in self._iter_lines():
+            if isinstance(line, str):
+                yield line
+
+    def content_hash(self) -> str:
+        """
+        Hashes the content of the block, Merkle style: its type, indentation, docs,
+        imports and lines, and the hashes of the lazily inserted blocks. The hash is
+        kept until the block changes, so the hashes of the unchanged inserted blocks
+        are reused when a block that contains them is hashed again.
+
+        Returns:
+            str: The SHA-256 hex digest of the content, equal for blocks with the same
+                content. Blocks may generate the same syntax with different contents,
+                for example a block inserted lazily and its syntax inserted by value.
+        """
+        digest = self._cache.get(_HASH_KEY)
+        if digest is None:
+            # Python syntax can't contain null characters, so they separate the parts
+            content = "\0".join((type(self).__qualname__, *self._iter_hash_parts()))
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            self._cache[_HASH_KEY] = digest
+        return digest
+
+    def _iter_hash_parts(self) -> Iterator[str]:
+        """
+        Yields:
+            str: The parts of the content of the block that are hashed, the sections
+                are counted or tagged so different contents don't yield the same parts.
+        """
+        yield self._indentation
+        yield self._import_sorter or ""
+        yield f"docs {len(self._docs)}"
+        yield from self._docs
+        yield f"imports {len(self._imports)}"
+        yield from sorted(self._imports)
+        for line in self._iter_lines():
+            if isinstance(line, str):
+                yield "s" + line
+            else:
+                yield "b" + line.content_hash()
+
+    def _contains(self, value: str, indent: int = 0) -> bool:
+        """
+        Checks whether a single line value, that doesn't start with spaces, is a part
+        of the block syntax. Such a value is a part of a rendered line exactly when it's
+        a part of the line without its indentation.
+
+        Args:
+            value (str): The value that we want to find.
+            indent (int): How much to indent the imports of the block syntax.
+
+        Returns:
+            bool: True when the value is a part of the block syntax.
+        """
+        if self._index is None:
+            self._index = ContentIndex()
+            self._index_content(self._index)
+        if value in self._index:
+            return True
+        imports = frozenset(self._index.imports)
+        return bool(imports) and value in self._format_imports(indent, imports)
+
+    def _collect_imports(self) -> FrozenSet[str]:
+        """
+        Returns:
+            FrozenSet[str]: The imports of the block and of the lazily inserted blocks.
+        """
+        imports = self._cache.get(None)
+        if imports is None:
+            imports = set(self._imports)
+            for line in self._lines:
+                if isinstance(line, Block):
+                    imports.update(line._collect_imports())  # pylint: disable=W0212
+            imports = self._cache[None] = frozenset(imports)
+        return imports
+
+    def _invalidate(self) -> None:
+        """
+        Clears the rendered syntax of the block and of the blocks that contain it.
+        """
+        self._cache.clear()
+        collected = []
+        for key, reference in self._parents.items():
+            parent = reference()
+            if parent is None:
+                collected.append(key)
+            else:
+                parent._invalidate()  # pylint: disable=protected-access
+        for key in collected:
+            del self._parents[key]
+
+    def _render_docs(self, renderer: Renderer, prefix: str) -> None:
+        renderer.write('"""', prefix)
+        for doc in self._docs:
+            renderer.new_line()
+            renderer.write(doc, prefix)
+        renderer.new_line()
+        renderer.write('"""', prefix)
+        renderer.new_line()
+
+    def _format_imports(
+        self, indent: int, imports: Optional[FrozenSet[str]] = None
+    ) -> str:
+        if imports is None:
+            imports = self._collect_imports()
+        prefix = self._indentation * indent
+        sorter = self._import_sorter or self.import_sorter
+        key = (imports, prefix, sorter)
+        syntax = IMPORTS_CACHE.get(key)
+        if syntax is None:
+            if sorter == "native":
+                syntax = sort_imports(imports, prefix)
+            if syntax is None:
+                # Slow to import, so only the blocks that sort by isort import it
+                import isort  # pylint: disable=import-outside-toplevel
+
+                format_line = partial(self.parse_block, new_line=1, indent=indent)
+                syntax = "".join(format_line(import_) for import_ in imports)
+                syntax = isort.code(syntax.strip("\n"))
+            IMPORTS_CACHE.set(key, syntax)
         return syntax
 
-    def _format_imports(self, indent: int) -> str:
-        format_line = partial(self.parse_block, new_line=1, indent=indent)
-        syntax = "".join(format_line(import_) for import_ in self._imports)
-        return isort.code(syntax.strip("\n"))
+    def _render(self, renderer: Renderer, indent: int, imports: bool) -> None:
+        """
+        Writes the block syntax into a given renderer.
+
+        Args:
+            renderer (Renderer): The renderer that collects the syntax.
+            indent (int): How much to indent the block syntax.
+            imports (bool): Whether to add imports or not to the block syntax.
+        """
+        for _ in self._iter_render(renderer, indent, imports):
+            pass
+
+    def _iter_render(
+        self, renderer: Renderer, indent: int, imports: bool
+    ) -> Iterator[None]:
+        """
+        Writes the block syntax into a given renderer, yields after each part of the
+        syntax so the renderer may be drained.
+
+        Args:
+            renderer (Renderer): The renderer that collects the syntax.
+            indent (int): How much to indent the block syntax.
+            imports (bool): Whether to add imports or not to the block syntax.
+        """
+        prefix = self._indentation * indent
+        start = renderer.tell()
+        if self._docs:
+            self._render_docs(renderer, prefix)
+        if imports and self._collect_imports():
+            if renderer.tell() != start:
+                renderer.new_line()
+            renderer.write(self._format_imports(indent))
+        if self._lines:
+            if renderer.tell() != start:
+                renderer.new_line()
+            renderer.open_section()
+            for line in self._iter_lines():
+                yield
+                renderer.new_line()
+                if isinstance(line, str):
+                    renderer.write(line, prefix)
+                else:
+                    line._render_inserted(renderer, prefix)  # pylint: disable=W0212
+            renderer.close_section()
+        if renderer.tell() != start and not renderer.ends_with_new_line:
+            renderer.new_line()
+
+    def _render_inserted(self, renderer: Renderer, prefix: str) -> None:
+        """
+        Writes the block syntax into a given renderer as a lazily inserted block, the
+        rendered fragment is reused until the block changes.
+
+        Args:
+            renderer (Renderer): The renderer that collects the syntax.
+            prefix (str): The indentation of the block that inserted this block.
+        """
+        key = renderer.prefix + prefix
+        fragment = self._cache.get(key)
+        if fragment is not None:
+            renderer.replay(fragment)
+            return
+        renderer.open_frame(prefix)
+        self._render(renderer, 0, False)
+        fragment = renderer.close_frame()
+        if renderer.memoize:
+            self._cache[key] = fragment
 
     def syntax(self, indent: int = 0, imports: bool = True) -> str:
         """
@@ -303,31 +1019,68 @@ class Block:
         Returns:
             str: The block syntax.
         """
-        format_line = partial(self.parse_block, new_line=1, indent=indent)
-        syntax = ""
-        if self._docs:
-            syntax += self._format_docs(indent)
-        if imports and self._imports:
-            if syntax:
-                syntax += "\n"
-            syntax += self._format_imports(indent)
-        if self._lines:
-            if syntax:
-                syntax += "\n"
-            syntax += "".join(format_line(str(line)) for line in self._lines).strip(
-                "\n"
-            )
-        if syntax and syntax[-1] != "\n":
-            return syntax + "\n"
+        key = (indent, imports)
+        syntax = self._cache.get(key)
+        if syntax is None:
+            renderer = Renderer()
+            self._render(renderer, indent, imports)
+            syntax = self._cache[key] = renderer.getvalue()
         return syntax
 
-    def use_black(self) -> str:
+    def iter_syntax(
+        self, indent: int = 0, imports: bool = True, buffer_size: int = BUFFER_SIZE
+    ) -> Iterator[str]:
+        """
+        Convert the block structure to Python syntax, chunk by chunk, the joined chunks
+        are equal to the block syntax.
+
+        Args:
+            indent (int): How much to indent the block syntax.
+            imports (bool): Whether to add imports or not to the block syntax.
+            buffer_size (int): How many rendered lines to collect before yielding them.
+
+        Yields:
+            str: The next chunk of the block syntax.
+        """
+        syntax = self._cache.get((indent, imports))
+        if syntax is not None:
+            if syntax:
+                yield syntax
+            return
+        renderer = Renderer(memoize=False)
+        for _ in self._iter_render(renderer, indent, imports):
+            if renderer.buffered >= buffer_size:
+                yield renderer.drain()
+        syntax = renderer.getvalue()
+        if syntax:
+            yield syntax
+
+    def write_to(self, file: TextIO, indent: int = 0, imports: bool = True) -> None:
+        """
+        Streams the block syntax into an open text file, the syntax is never held in
+        memory as a whole. For sockets use `socket.makefile("w")`.
+
+        Args:
+            file (TextIO): An open text file or any object with a `write` method.
+            indent (int): How much to indent the block syntax.
+            imports (bool): Whether to add imports or not to the block syntax.
+        """
+        for chunk in self.iter_syntax(indent, imports):
+            file.write(chunk)
+
+    def use_black(self, jobs: int = 1) -> str:
         """
         Convert the block structure to python syntax formatted by Black.
 
         References:
             * Black docs - https://github.com/psf/black
             * The solution - https://stackoverflow.com/a/57653302
+            * Caching the results - `codemate.formatter.enable_cache`
+            * The rendered syntax is parsed once - `codemate.pipeline.Pipeline`
+
+        Args:
+            jobs (int): How many processes format the top-level functions and classes
+                in parallel, the result is the same for any amount.
 
         Returns:
             str: The block syntax.
@@ -335,12 +1088,67 @@ class Block:
         Raises:
             InputError: When the generated Python 3 code isn't valid.
         """
-        self.validate()
-        return black.format_str(self.syntax(), mode=black.Mode())
+        return Pipeline(self, jobs).format()
+
+    def tree(self) -> ast.Module:
+        """
+        Parses the block syntax, the tree can be compiled to a code object, or converted
+        back to a syntax by `ast.unparse` in Python 3.9+.
+
+        Returns:
+            ast.Module: The syntax tree, its line numbers are the ones in the syntax.
+
+        Raises:
+            InputError: When the generated Python 3 code isn't valid.
+        """
+        return validator.parse(self.syntax())
+
+    def _count_statements(self, prefix: str, imports: bool) -> Optional[int]:
+        """
+        Args:
+            prefix (str): The indentation of the block syntax.
+            imports (bool): Whether to add imports or not to the block syntax.
+
+        Returns:
+            Optional[int]: How many statements the block syntax has, None when a part
+                of the block can't be parsed on its own.
+        """
+        key = ("statements", prefix, imports)
+        if key not in self._cache:
+            self._cache[key] = self._parse_parts(prefix, imports)
+        return self._cache[key]
+
+    def _parse_parts(self, prefix: str, imports: bool) -> Optional[int]:
+        parts: List[Optional[int]] = []
+        if self._docs:
+            parts.append(_count(('"""', *self._docs, '"""'), prefix))
+        if imports and self._collect_imports():
+            parts.append(_count((self._format_imports(0),), prefix))
+        lines: List[str] = []
+        for line in self._iter_lines():
+            if isinstance(line, str):
+                lines.append(line)
+                continue
+            if lines:
+                parts.append(_count(lines, prefix))
+                lines = []
+            parts.append(line._count_statements(prefix, False))  # pylint: disable=W0212
+        if lines:
+            parts.append(_count(lines, prefix))
+        count = 0
+        for part in parts:
+            if part is None:
+                return None
+            count += part
+        return count
 
     def validate(self, raise_error: bool = True) -> bool:
         """
-        Checks if the generated syntax is Python 3 valid.
+        Checks if the generated syntax is Python 3 valid. The signatures of the
+        structures, each run of syntax lines and each lazily inserted block are parsed
+        on their own, so only the parts that changed since the last validation are
+        parsed again. When a part can't be parsed on its own, for example a line that
+        opens a statement that an inserted block completes, the whole syntax is parsed.
 
         Args:
             raise_error (bool): When True and the syntax is invalid, an exception will be
@@ -352,25 +1160,55 @@ class Block:
         Raises:
             InputError: When the generated Python 3 code isn't valid.
         """
-        try:
-            validator.validate(self.syntax(), raise_error=True)
-        except InputError as error:
-            if raise_error:
-                raise error from None
-            return False
-        return True
+        if self._count_statements("", True) is not None:
+            return True
+        return validator.validate(self.syntax(), raise_error)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in _state_slots(type(self))}
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._cache = {}
+        self._parents = {}
+        self._index = None
+        for line in self._lines:
+            if isinstance(line, Block):
+                line._attach(self)
 
     def __repr__(self) -> str:
         class_name = getattr(type(self), "__name__", type(self))
-        return f"{class_name}({vars(self)})"
+        return f"{class_name}({self.__getstate__()})"
 
     def __str__(self) -> str:
         return self.syntax()
 
+    def __eq__(self, other: object) -> bool:
+        """
+        x.__eq__(y) <==> x == y, the blocks are equal when their content hashes are.
+        """
+        if not isinstance(other, Block):
+            return NotImplemented
+        return self is other or self.content_hash() == other.content_hash()
+
+    def __hash__(self) -> int:
+        """
+        x.__hash__() <==> hash(x), the hash of the content, so a block shouldn't change
+        while it's a key of a dict or a member of a set.
+        """
+        return hash(self.content_hash())
+
     def __contains__(self, value: str) -> bool:
         """
         x.__contains__(y) <==> y in x.
 
+        A single line value is found by an index of the lines of the block and of the
+        inserted blocks, without rendering the block. A value that spans lines or starts
+        with spaces is found in the block syntax.
+
         Raises:
             ValueError: When the provided input isn't instance of string.
         """
@@ -378,4 +1216,6 @@ class Block:
             type_name = type(value).__name__
             error = f"Argument 'value' should be instance of 'str' not '{type_name}'"
             raise ValueError(error)
-        return value in str(self)
+        if not value or "\n" in value or value[0] == " ":
+            return value in str(self)
+        return self._contains(value)
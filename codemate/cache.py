@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, NamedTuple, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    """
+    The statistics of a cache.
+
+    Attributes:
+        hits (int): How many lookups found a value.
+        misses (int): How many lookups didn't find a value.
+        evictions (int): How many values were removed to keep the cache bounded.
+        maxsize (int): The maximal amount of values in the cache.
+        currsize (int): The current amount of values in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[V]):
+    """
+    A thread safe mapping that keeps the least recently used values up to a given size.
+
+    Args:
+        maxsize (int): The maximal amount of values in the cache.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._values: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        int: The maximal amount of values in the cache, the least recently used values
+            are evicted when it is decreased.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns the value of a given key and marks it as recently used.
+
+        Args:
+            key (Hashable): The key of the value.
+
+        Returns:
+            Optional[V]: The value, None when the key is missing.
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """
+        Stores a value of a given key, evicts the least recently used values when the
+        cache is full.
+
+        Args:
+            key (Hashable): The key of the value.
+            value (V): The value.
+        """
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            self._evict()
+
+    def info(self) -> CacheInfo:
+        """
+        Returns:
+            CacheInfo: The statistics of the cache.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._maxsize,
+                len(self._values),
+            )
+
+    def clear(self) -> None:
+        """
+        Removes all the values and resets the statistics.
+        """
+        with self._lock:
+            self._values.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def _evict(self) -> None:
+        while len(self._values) > max(self._maxsize, 0):
+            self._values.popitem(last=False)
+            self._evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
@@ -1,4 +1,5 @@
-import black
+import sys
+from typing import TYPE_CHECKING, Any, Dict
 
 
 class GenerationError(Exception):
@@ -9,12 +10,54 @@ class PythonSyntaxError(GenerationError, SyntaxError):
     """Represents an exception in the Python syntax"""
 
 
-class InputError(GenerationError, black.InvalidInput, ValueError):
+def _define_input_error() -> type:
     """
-    Raised when the generated Python code isn't valid.
-    Deprecation - in version 1.0.0, black.InvalidInput inheritance will be removed.
+    Defines `InputError`, it inherits `black.InvalidInput` so Black is imported only
+    when the exception is used.
     """
+    import black  # pylint: disable=import-outside-toplevel
+
+    class InputError(GenerationError, black.InvalidInput, ValueError):
+        """
+        Raised when the generated Python code isn't valid.
+        Deprecation - in version 1.0.0, black.InvalidInput inheritance will be removed.
+        """
+
+    InputError.__qualname__ = InputError.__name__
+    return InputError
+
+
+if TYPE_CHECKING:
+    from black import InvalidInput
+
+    class InputError(GenerationError, InvalidInput, ValueError):
+        """Raised when the generated Python code isn't valid"""
+
+elif sys.version_info < (3, 7):
+    # Module attributes can't be defined lazily before Python 3.7
+    InputError = _define_input_error()
+else:
+
+    def __getattr__(name: str) -> Any:
+        if name == "InputError":
+            globals()[name] = _define_input_error()
+            return globals()[name]
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SaveFileError(GenerationError, OSError):
     """Raised when the generated Python code file can't be created"""
+
+
+class PackageSaveError(GenerationError):
+    """
+    Raised when some of the generated Python package files can't be created.
+
+    Args:
+        errors (Dict[str, Exception]): The errors by the paths of the files that failed.
+    """
+
+    def __init__(self, errors: Dict[str, Exception]) -> None:
+        self.errors = errors
+        paths = ", ".join(sorted(errors))
+        super().__init__(f"Can't create the generated files: {paths}")
@@ -1,56 +1,202 @@
+import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional, Union, cast
 
 from codemate.block import Block
 from codemate.exceptions import SaveFileError
+from codemate.pipeline import Pipeline
+from codemate.renderer import Renderer
 
+# The default header of a file, it's generated when the file is created
+_DEFAULT_HEADER = cast(str, object())
 
-def generate_header() -> str:
+# Written instead of the fingerprint of the rendered syntax, before it is hashed
+_PLACEHOLDER = "\0fingerprint\0"
+
+_FINGERPRINT = "Fingerprint"
+_VERSION = "Version"
+
+
+def generate_header(
+    fingerprint: Optional[str] = None, version: Optional[str] = None
+) -> str:
     """
     Generates a file header.
 
+    Args:
+        fingerprint (Optional[str]): A stable fingerprint of the file, when given it
+            replaces the generation date and the header is deterministic.
+        version (Optional[str]): The version of the generator.
+
     Returns:
         str: The generated header of a file.
     """
     syntax = " Warning generated file ".center(90, "-")
-    date = datetime.now().isoformat()
     syntax += "\n"
-    syntax += f"Generated at: {date}"
+    if fingerprint is None:
+        date = datetime.now().isoformat()
+        syntax += f"Generated at: {date}"
+    else:
+        syntax += f"{_FINGERPRINT}: {fingerprint}"
+    if version is not None:
+        syntax += f"\n{_VERSION}: {version}"
     syntax += "\n"
     syntax += "".center(90, "-")
     return syntax
 
 
+def _read_header(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Reads the fingerprint and the version of a generated header, the lines are read
+    until the end of the header.
+    """
+    metadata: Dict[str, str] = {}
+    lines = iter(lines)
+    if next(lines, "").strip() != '"""':
+        return metadata
+    for line in lines:
+        line = line.strip()
+        if line == '"""':
+            break
+        key, separator, value = line.partition(": ")
+        if separator and key in (_FINGERPRINT, _VERSION):
+            metadata[key] = value
+    return metadata
+
+
 class File(Block):
     """
     Creates a Python file syntax.
 
+    A file with a fingerprint has a deterministic header, the same generator inputs
+    always generate the same file, which allows skipping the files that are up to date.
+
     Args:
-        header (Optional[str]): A block string that represents the files header
+        header (Optional[str]): A block string that represents the files header,
+            defaults to a header with the generation date.
+        fingerprint (Union[bool, str]): A stable fingerprint that is added to the
+            header, for example a hash of the generator inputs. When True, the hash of
+            the rendered syntax is used.
+        version (Optional[str]): The version of the generator, added to the header.
+
+    Raises:
+        ValueError: When a fingerprint or a version is given without a header.
     """
 
-    def __init__(self, header: Optional[str] = generate_header()) -> None:
+    __slots__ = ("_fingerprint", "_version")
+
+    def __init__(
+        self,
+        header: Optional[str] = _DEFAULT_HEADER,
+        fingerprint: Union[bool, str] = False,
+        version: Optional[str] = None,
+    ) -> None:
         super().__init__()
+        self._fingerprint = fingerprint
+        self._version = version
+        stable = _PLACEHOLDER if fingerprint is True else fingerprint or None
+        if header is _DEFAULT_HEADER:
+            header = generate_header(stable, version)
+        elif stable is not None or version is not None:
+            if not header:
+                raise ValueError("A fingerprint or a version requires a header")
+            if stable is not None:
+                header += f"\n{_FINGERPRINT}: {stable}"
+            if version is not None:
+                header += f"\n{_VERSION}: {version}"
         if header:
             self.add_doc_block(block=header)
 
-    def save(self, path: str, use_black: bool = True) -> None:
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """
+        Optional[str]: The fingerprint in the file header, None when the file has no
+            fingerprint.
+        """
+        if self._fingerprint is True:
+            return _read_header(self.syntax().split("\n")).get(_FINGERPRINT)
+        return self._fingerprint or None
+
+    def is_up_to_date(self, path: str) -> bool:
         """
-        Save the generated Python file in a given location.
+        Checks whether a saved file has the fingerprint and the version of this file,
+        only the header of the saved file is read.
+
+        Args:
+            path (str): The path of the saved file.
+
+        Returns:
+            bool: True when the saved file is up to date, always False when this file
+                has no fingerprint.
+        """
+        fingerprint = self.fingerprint
+        if fingerprint is None:
+            return False
+        try:
+            with open(path, encoding="utf-8") as file:
+                metadata = _read_header(file)
+        except (OSError, UnicodeDecodeError):
+            return False
+        return metadata.get(_FINGERPRINT) == fingerprint and (
+            metadata.get(_VERSION) == self._version
+        )
+
+    def _iter_render(
+        self, renderer: Renderer, indent: int, imports: bool
+    ) -> Iterator[None]:
+        if self._fingerprint is not True:
+            yield from super()._iter_render(renderer, indent, imports)
+            return
+        # The fingerprint is the hash of the syntax with a placeholder instead of it,
+        # so the whole syntax is rendered before it is written
+        body = Renderer(memoize=renderer.memoize)
+        for _ in super()._iter_render(body, indent, imports):
+            pass
+        syntax = body.getvalue()
+        digest = hashlib.sha256(syntax.encode("utf-8")).hexdigest()
+        renderer.write(syntax.replace(_PLACEHOLDER, digest, 1))
+
+    def _contains(self, value: str, indent: int = 0) -> bool:
+        if self._fingerprint is True:
+            # The header depends on the whole syntax, so the value is found in it
+            return value in self.syntax(indent)
+        return super()._contains(value, indent)
+
+    def _parse_parts(self, prefix: str, imports: bool) -> Optional[int]:
+        if self._fingerprint is True:
+            # The header depends on the whole syntax, so the syntax is parsed as a whole
+            return None
+        return super()._parse_parts(prefix, imports)
+
+    def save(
+        self,
+        path: str,
+        use_black: bool = True,
+        jobs: int = 1,
+        incremental: bool = False,
+    ) -> bool:
+        """
+        Save the generated Python file in a given location. The file is written to a
+        temporary file that replaces the file when it's complete.
 
         Args:
             path (str): The path to the location that we want to save the file at.
             use_black (bool): When true black linter will be used to format the generated
                 Python code.
+            jobs (int): How many processes are used by black to format the file.
+            incremental (bool): When true the file isn't written if it already has the
+                generated content, its modification time is kept. A file with a
+                fingerprint isn't even formatted when the saved file is up to date.
+
+        Returns:
+            bool: True when the file was written, False when it was unchanged.
 
         Raises:
             SaveFileError: When the generated Python code file can't be created.
         """
+        if incremental and self.is_up_to_date(path):
+            return False
         try:
-            with open(path, "w", encoding="utf-8") as file:
-                if use_black:
-                    file.write(self.use_black())
-                else:
-                    file.write(self.syntax())
+            return Pipeline(self, jobs).save(path, use_black, incremental)
         except OSError as error:
             raise SaveFileError("Can't create the generated file") from error
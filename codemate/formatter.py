@@ -0,0 +1,379 @@
+import ast
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from functools import partial
+from typing import Callable, FrozenSet, List, NamedTuple, Optional, TypeVar, cast
+
+import black
+
+from codemate.cache import LRUCache
+
+T = TypeVar("T")
+
+# The default location of the on-disk tier, Black keeps its own cache in the same place
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "codemate",
+)
+
+# The top-level statements that are formatted as separate fragments
+_STRUCTURES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+class FormatCacheInfo(NamedTuple):
+    """
+    The statistics of the formatting cache.
+
+    Attributes:
+        hits (int): How many sources were found in the cache, Black wasn't called.
+        disk_hits (int): How many of the hits were found on disk only.
+        misses (int): How many sources were formatted by Black.
+        currsize (int): How many sources are kept in memory.
+    """
+
+    hits: int
+    disk_hits: int
+    misses: int
+    currsize: int
+
+
+class FormatCache:
+    """
+    Keeps the formatted sources by the hash of the source, the Black mode and the Black
+    version, in a bounded memory tier and an optional disk tier.
+
+    Args:
+        maxsize (int): The maximal amount of formatted sources in memory.
+        directory (Optional[str]): The directory of the disk tier, None to keep the
+            formatted sources in memory only.
+    """
+
+    def __init__(self, maxsize: int = 4096, directory: Optional[str] = None) -> None:
+        self.directory = directory
+        self._memory: LRUCache[str] = LRUCache(maxsize)
+        self._features: LRUCache[FrozenSet[black.Feature]] = LRUCache(maxsize)
+        self._disk_hits = 0
+        self._misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def format_str(self, source: str, mode: black.Mode) -> str:
+        """
+        Formats a source by Black unless it was already formatted.
+
+        Args:
+            source (str): The Python source.
+            mode (black.Mode): The Black formatting options.
+
+        Returns:
+            str: The formatted source.
+        """
+        return self.format_many([source], mode)[0]
+
+    def format_many(
+        self, sources: List[str], mode: black.Mode, jobs: int = 1
+    ) -> List[str]:
+        """
+        Formats sources by Black unless they were already formatted.
+
+        Args:
+            sources (List[str]): The Python sources.
+            mode (black.Mode): The Black formatting options.
+            jobs (int): How many processes format the missing sources.
+
+        Returns:
+            List[str]: The formatted sources, in the order of the sources.
+        """
+        keys = [_hash(source, repr(mode)) for source in sources]
+        formatted = [self._lookup(key) for key in keys]
+        missing = [index for index, value in enumerate(formatted) if value is None]
+        self._misses += len(missing)
+        format_sources = partial(_format_sources, mode=mode)
+        values = _map(format_sources, [sources[index] for index in missing], jobs)
+        for index, value in zip(missing, values):
+            formatted[index] = value
+            self._memory.set(keys[index], value)
+            self._store(keys[index], ".py", value)
+        return cast(List[str], formatted)
+
+    def features_many(
+        self, sources: List[str], jobs: int = 1
+    ) -> List[FrozenSet[black.Feature]]:
+        """
+        Detects the Python features that are used by sources, as Black detects them
+        to infer the target versions. The statistics are not affected.
+
+        Args:
+            sources (List[str]): The Python sources.
+            jobs (int): How many processes detect the features of the missing sources.
+
+        Returns:
+            List[FrozenSet[black.Feature]]: The used features, in the order of the
+                sources.
+        """
+        keys = [_hash(source, "features") for source in sources]
+        features = [self._lookup_features(key) for key in keys]
+        missing = [index for index, value in enumerate(features) if value is None]
+        values = _map(_detect_features, [sources[index] for index in missing], jobs)
+        for index, value in zip(missing, values):
+            features[index] = value
+            self._features.set(keys[index], value)
+            names = " ".join(sorted(feature.name for feature in value))
+            self._store(keys[index], ".features", names)
+        return cast(List[FrozenSet[black.Feature]], features)
+
+    def info(self) -> FormatCacheInfo:
+        """
+        Returns:
+            FormatCacheInfo: The statistics of the cache.
+        """
+        memory = self._memory.info()
+        return FormatCacheInfo(
+            memory.hits + self._disk_hits,
+            self._disk_hits,
+            self._misses,
+            memory.currsize,
+        )
+
+    def _lookup(self, key: str) -> Optional[str]:
+        formatted = self._memory.get(key)
+        if formatted is None:
+            formatted = self._load(key, ".py")
+            if formatted is not None:
+                self._disk_hits += 1
+                self._memory.set(key, formatted)
+        return formatted
+
+    def _lookup_features(self, key: str) -> Optional[FrozenSet[black.Feature]]:
+        features = self._features.get(key)
+        if features is None:
+            names = self._load(key, ".features")
+            if names is not None:
+                features = frozenset(black.Feature[name] for name in names.split())
+                self._features.set(key, features)
+        return features
+
+    def _load(self, key: str, suffix: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key, suffix), encoding="utf-8", newline="") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _store(self, key: str, suffix: str, content: str) -> None:
+        if not self.directory:
+            return
+        # Written to a temporary file first, concurrent builds never read partial files
+        try:
+            fd, path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+            with open(fd, "w", encoding="utf-8", newline="") as file:
+                file.write(content)
+            os.replace(path, self._path(key, suffix))
+        except OSError:
+            pass
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory or "", key + suffix)
+
+
+# The cache that is used by format_str, None when caching is disabled
+_CACHE: Optional[FormatCache] = None
+
+
+def _hash(source: str, context: str) -> str:
+    content = f"{black.__version__}\0{context}\0{source}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _format_sources(sources: List[str], mode: black.Mode) -> List[str]:
+    return [black.format_str(source, mode=mode) for source in sources]
+
+
+def _detect_features(sources: List[str]) -> List[FrozenSet[black.Feature]]:
+    return [
+        frozenset(black.get_features_used(black.lib2to3_parse(source.lstrip())))
+        for source in sources
+    ]
+
+
+def _map(
+    func: Callable[[List[str]], List[T]], sources: List[str], jobs: int
+) -> List[T]:
+    """
+    Applies a function on the sources, when jobs is more than 1 the sources are split
+    into contiguous chunks of a similar size that are processed in parallel.
+    """
+    if jobs <= 1 or len(sources) <= 1:
+        return func(sources)
+    # A few chunks per process, a big chunk doesn't hold back the others
+    chunk_size = sum(map(len, sources)) / (jobs * 4)
+    chunks: List[List[str]] = [[]]
+    size = 0
+    for source in sources:
+        if size >= chunk_size:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(source)
+        size += len(source)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+        return [value for values in executor.map(func, chunks) for value in values]
+
+
+def enable_cache(
+    maxsize: int = 4096, use_disk: bool = True, directory: Optional[str] = None
+) -> FormatCache:
+    """
+    Enables caching of the Black formatting, the previous cache is dropped.
+
+    Args:
+        maxsize (int): The maximal amount of formatted sources in memory.
+        use_disk (bool): Whether the formatted sources are kept on disk as well.
+        directory (Optional[str]): The directory of the disk tier, defaults to
+            `CACHE_DIR`.
+
+    Returns:
+        FormatCache: The enabled cache.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    if use_disk:
+        directory = directory or CACHE_DIR
+    else:
+        directory = None
+    _CACHE = FormatCache(maxsize, directory)
+    return _CACHE
+
+
+def disable_cache() -> None:
+    """
+    Disables caching of the Black formatting, every source is formatted by Black.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    _CACHE = None
+
+
+def cache_info() -> Optional[FormatCacheInfo]:
+    """
+    Returns:
+        Optional[FormatCacheInfo]: The statistics of the cache, None when caching is
+            disabled.
+    """
+    return _CACHE.info() if _CACHE else None
+
+
+def format_str(source: str, mode: Optional[black.Mode] = None) -> str:
+    """
+    Formats a Python source by Black, using the cache when it is enabled.
+
+    Args:
+        source (str): The Python source.
+        mode (Optional[black.Mode]): The Black formatting options, defaults to the
+            default Black mode.
+
+    Returns:
+        str: The formatted source.
+    """
+    mode = mode or black.Mode()
+    if _CACHE is None:
+        return black.format_str(source, mode=mode)
+    return _CACHE.format_str(source, mode)
+
+
+def split_module(source: str, tree: Optional[ast.Module] = None) -> Optional[List[str]]:
+    """
+    Splits a module into fragments that Black formats independently, each top-level
+    function or class is a fragment and so is the code between them. A fragment isn't
+    split from a comment that precedes it, Black keeps such comments attached.
+
+    Args:
+        source (str): The Python source of a module.
+        tree (Optional[ast.Module]): The syntax tree of the source, when it was already
+            parsed.
+
+    Returns:
+        Optional[List[str]]: The fragments, None when the module can't be split safely.
+    """
+    if "fmt:" in source or "\r" in source or "unicode_literals" in source:
+        return None
+    if tree is None:
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return None
+    lines = source.split("\n")
+    starts = [0]
+    previous_structure = False
+    for index, node in enumerate(tree.body):
+        structure = isinstance(node, _STRUCTURES)
+        if index and (structure or previous_structure):
+            decorators = getattr(node, "decorator_list", [])
+            start = min([node.lineno] + [line.lineno for line in decorators]) - 1
+            if _can_split(lines, start):
+                starts.append(start)
+        previous_structure = structure
+    ends = starts[1:] + [len(lines)]
+    return ["\n".join(lines[start:end]) for start, end in zip(starts, ends)]
+
+
+def _can_split(lines: List[str], start: int) -> bool:
+    for index in range(start - 1, -1, -1):
+        line = lines[index].strip()
+        if line:
+            return not line.startswith("#")
+    return False
+
+
+def format_module(
+    source: str,
+    mode: Optional[black.Mode] = None,
+    jobs: int = 1,
+    tree: Optional[ast.Module] = None,
+) -> str:
+    """
+    Formats a Python module by Black, as `format_str` does.
+
+    When the cache is enabled or jobs is more than 1, the module is split by
+    `split_module` and the fragments are formatted independently. The cached fragments
+    aren't formatted again, so a change costs as much as the fragments it touches, and
+    the other fragments are formatted by a pool of processes. The fragments are joined
+    by the blank lines that Black puts around top-level functions and classes, and the
+    target versions are inferred from the whole module, so the result is equal to
+    formatting the whole module.
+
+    Args:
+        source (str): The Python source of a module.
+        mode (Optional[black.Mode]): The Black formatting options, defaults to the
+            default Black mode.
+        jobs (int): How many processes format the fragments in parallel.
+        tree (Optional[ast.Module]): The syntax tree of the source, when it was already
+            parsed it isn't parsed again to split the module.
+
+    Returns:
+        str: The formatted source.
+    """
+    mode = mode or black.Mode()
+    if (_CACHE is None and jobs <= 1) or mode.is_pyi:
+        return format_str(source, mode)
+    fragments = split_module(source, tree)
+    if not fragments or len(fragments) == 1:
+        return format_str(source, mode)
+    # Without the cache, a cache that keeps nothing formats the fragments
+    cache = _CACHE or FormatCache(maxsize=0)
+    if not mode.target_versions:
+        features = frozenset().union(*cache.features_many(fragments, jobs))
+        versions = {
+            version
+            for version in black.TargetVersion
+            if features <= black.VERSION_TO_FEATURES[version]
+        }
+        if not versions:
+            return format_str(source, mode)
+        # When Python 2 is a target, every fragment detects the same formatting
+        # features by itself, and explicitly targeting it makes Black warn
+        if black.TargetVersion.PY27 not in versions:
+            mode = replace(mode, target_versions=versions)
+    return "\n\n".join(cache.format_many(fragments, mode, jobs))
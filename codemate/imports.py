@@ -0,0 +1,171 @@
+"""
+A native sorter of import lines, an alternative to isort for the imports of blocks.
+
+It supports the imports that are added by `Block.add_import` and
+`Block.add_specific_import` and produces the same syntax as `isort.code` with its
+default settings:
+
+* The imports are split into the future, standard library and third party sections.
+* Each section starts with the `import x` lines, followed by the `from x import y` lines.
+* The modules are sorted naturally and case insensitively, the names of `from` imports
+  are merged, deduplicated and sorted by type - constants, classes, then the rest.
+* Long `from` imports are wrapped in parentheses in a grid.
+
+Unlike isort, modules of the current project are not detected as first party modules.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# The maximal length of an import line, the indentation is included
+LINE_LENGTH = 79
+
+# The Python 3 standard library modules, as they are known by isort
+STDLIB_MODULES = frozenset(
+    """
+_ast _dummy_thread _thread _tkinter abc aifc argparse array ast asynchat asyncio
+asyncore atexit audioop base64 bdb binascii binhex bisect builtins bz2 cProfile
+calendar cgi cgitb chunk cmath cmd code codecs codeop collections colorsys
+compileall concurrent configparser contextlib contextvars copy copyreg crypt csv
+ctypes curses dataclasses datetime dbm decimal difflib dis distutils doctest
+dummy_threading email encodings ensurepip enum errno faulthandler fcntl filecmp
+fileinput fnmatch formatter fpectl fractions ftplib functools gc getopt getpass
+gettext glob graphlib grp gzip hashlib heapq hmac html http idlelib imaplib imghdr
+imp importlib inspect io ipaddress itertools json keyword lib2to3 linecache locale
+logging lzma macpath mailbox mailcap marshal math mimetypes mmap modulefinder msilib
+msvcrt multiprocessing netrc nis nntplib ntpath numbers operator optparse os
+ossaudiodev parser pathlib pdb pickle pickletools pipes pkgutil platform plistlib
+poplib posix posixpath pprint profile pstats pty pwd py_compile pyclbr pydoc queue
+quopri random re readline reprlib resource rlcompleter runpy sched secrets select
+selectors shelve shlex shutil signal site sitecustomize smtpd smtplib sndhdr socket
+socketserver spwd sqlite3 sre sre_compile sre_constants sre_parse ssl stat
+statistics string stringprep struct subprocess sunau symbol symtable sys sysconfig
+syslog tabnanny tarfile telnetlib tempfile termios test textwrap threading time
+timeit tkinter token tokenize tomllib trace traceback tracemalloc tty turtle
+turtledemo types typing unicodedata unittest urllib usercustomize uu uuid venv
+warnings wave weakref webbrowser winreg winsound wsgiref xdrlib xml xmlrpc zipapp
+zipfile zipimport zlib zoneinfo
+    """.split()
+)
+
+_FUTURE = 0
+_STDLIB = 1
+_THIRD_PARTY = 2
+
+
+def sort_imports(imports: Iterable[str], indent: str = "") -> Optional[str]:
+    """
+    Merges and sorts import lines.
+
+    Args:
+        imports (Iterable[str]): The import lines, without indentation.
+        indent (str): The indentation of the imports syntax.
+
+    Returns:
+        Optional[str]: The sorted imports syntax, with a trailing new line when it isn't
+            indented. None when some import is not supported by the native sorter or
+            some line can't be wrapped within the line length, isort should be used.
+    """
+    sections: List[Tuple[Set[str], Dict[str, Set[str]]]] = [
+        (set(), {}) for _ in range(_THIRD_PARTY + 1)
+    ]
+    for line in imports:
+        parsed = _parse(line)
+        if parsed is None:
+            return None
+        module, names = parsed
+        straight, from_ = sections[_place(module)]
+        if names is None:
+            straight.add(module)
+        else:
+            from_.setdefault(module, set()).update(names)
+
+    line_length = max(LINE_LENGTH - len(indent), 0)
+    blocks = []
+    for straight, from_ in sections:
+        lines = [f"import {module}" for module in _sorted(straight, _module_key)]
+        if any(len(line) > line_length for line in lines):
+            return None
+        for module in _sorted(from_, _module_key):
+            names = _sorted(from_[module], _name_key)
+            from_line = _format_from(module, names, line_length)
+            if from_line is None:
+                return None
+            lines.append(from_line)
+        if lines:
+            blocks.append("\n".join(lines))
+    syntax = "\n\n".join(blocks)
+    if indent:
+        lines = syntax.split("\n")
+        return "\n".join(indent + line if line else line for line in lines)
+    return syntax + "\n"
+
+
+def _parse(line: str) -> Optional[Tuple[str, Optional[List[str]]]]:
+    words = line.split(" ", 3)
+    if len(words) == 2 and words[0] == "import":
+        module = words[1]
+        return (module, None) if _is_module(module) else None
+    if len(words) == 4 and words[0] == "from" and words[2] == "import":
+        module = words[1]
+        names = [name.strip() for name in words[3].split(",")]
+        if _is_module(module) and all(name.isidentifier() for name in names):
+            return module, names
+    return None
+
+
+def _is_module(module: str) -> bool:
+    return all(part.isidentifier() for part in module.split("."))
+
+
+def _place(module: str) -> int:
+    package = module.split(".", 1)[0]
+    if package == "__future__":
+        return _FUTURE
+    if package in STDLIB_MODULES:
+        return _STDLIB
+    return _THIRD_PARTY
+
+
+def _format_from(module: str, names: List[str], line_length: int) -> Optional[str]:
+    start = f"from {module} import "
+    line = start + ", ".join(names)
+    if len(line) <= line_length:
+        return line
+    if len(names) == 1:
+        return None
+    # Grid wrapping, the following lines are aligned to the opening parenthesis
+    white_space = " " * (len(start) + 1)
+    lines = [f"{start}({names[0]}"]
+    for name in names[1:]:
+        if len(lines[-1]) + len(name) + 3 > line_length:
+            lines[-1] += ","
+            lines.append(white_space + name)
+        else:
+            lines[-1] += ", " + name
+    lines[-1] += ")"
+    if any(len(line) > line_length for line in lines):
+        return None
+    return "\n".join(lines)
+
+
+def _sorted(items: Iterable[str], key: Any) -> List[str]:
+    # isort keeps the input order of equal keys, the items are compared to be stable
+    return sorted(items, key=lambda item: (_natural_key(key(item)), item))
+
+
+def _natural_key(text: str) -> List[Any]:
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", text)]
+
+
+def _module_key(module: str) -> str:
+    return module.lower()
+
+
+def _name_key(name: str) -> str:
+    if name.isupper() and len(name) > 1:
+        prefix = "A"
+    elif name[:1].isupper():
+        prefix = "B"
+    else:
+        prefix = "C"
+    return prefix + name.lower()
@@ -0,0 +1,39 @@
+from typing import Iterable, List, Set
+
+
+class ContentIndex:
+    """
+    An append only index of the content of a block and of the blocks that were inserted
+    into it lazily, it finds a text in the lines without joining or rendering them.
+
+    The lines are joined into chunks, a chunk is merged with the next one when it isn't
+    bigger, so the index holds a logarithmic amount of chunks and adding a line copies
+    the joined lines a logarithmic amount of times.
+
+    Attributes:
+        imports (Set[str]): The imports of the indexed blocks.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self.imports: Set[str] = set()
+
+    def add(self, lines: Iterable[str], imports: Iterable[str] = ()) -> None:
+        """
+        Args:
+            lines (Iterable[str]): Lines of an indexed block, without their indentation.
+            imports (Iterable[str]): Imports of an indexed block.
+        """
+        chunks = self._chunks
+        for line in lines:
+            chunks.append(line)
+            while len(chunks) > 1 and len(chunks[-2]) <= len(chunks[-1]):
+                last = chunks.pop()
+                chunks[-1] += "\n" + last
+        self.imports.update(imports)
+
+    def __contains__(self, value: str) -> bool:
+        """
+        x.__contains__(y) <==> y in x, the value should be a part of a single line.
+        """
+        return any(value in chunk for chunk in self._chunks)
@@ -0,0 +1,126 @@
+"""
+An opt-in pool of the strings that the generated structures keep, so the tokens that
+repeat across the generated trees, such as decorators, arguments, return types, imports
+and common syntax lines, share a single string each.
+
+Interning is disabled by default. When it's enabled, the `add_*` methods and the
+constructors of the blocks keep the pooled strings instead of their own copies.
+"""
+import sys
+from typing import Collection, Dict, NamedTuple, Optional
+
+
+class InternInfo(NamedTuple):
+    """
+    The statistics of the interning pool.
+
+    Attributes:
+        requests (int): How many strings were interned.
+        unique (int): How many distinct strings the pool keeps.
+        saved (int): How many bytes were saved, the sizes of the interned strings that
+            were replaced by an equal string of the pool.
+    """
+
+    requests: int
+    unique: int
+    saved: int
+
+    @property
+    def ratio(self) -> float:
+        """
+        float: The deduplication ratio, how many interned strings share each string of
+            the pool, 1.0 when nothing was shared.
+        """
+        return self.requests / self.unique if self.unique else 1.0
+
+
+class InternPool:
+    """
+    Keeps a single instance of each interned string. Unlike `sys.intern`, the strings
+    are released with the pool and the pool counts what it saved.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self._requests = 0
+        self._saved = 0
+
+    def intern(self, value: str) -> str:
+        """
+        Args:
+            value (str): A string that may repeat.
+
+        Returns:
+            str: The string of the pool that equals the value, the value itself when
+                it's new.
+        """
+        self._requests += 1
+        interned = self._strings.setdefault(value, value)
+        if interned is not value:
+            self._saved += sys.getsizeof(value)
+        return interned
+
+    def info(self) -> InternInfo:
+        """
+        Returns:
+            InternInfo: The statistics of the pool.
+        """
+        return InternInfo(self._requests, len(self._strings), self._saved)
+
+
+_POOL: Optional[InternPool] = None
+
+
+def enable_interning() -> InternPool:
+    """
+    Enables interning of the strings of the generated structures, the previous pool is
+    dropped. The strings that were kept before aren't interned.
+
+    Returns:
+        InternPool: The enabled pool.
+    """
+    global _POOL  # pylint: disable=global-statement
+    _POOL = InternPool()
+    return _POOL
+
+
+def disable_interning() -> None:
+    """
+    Disables interning, the pool is dropped and the structures keep their own strings.
+    """
+    global _POOL  # pylint: disable=global-statement
+    _POOL = None
+
+
+def interning_info() -> Optional[InternInfo]:
+    """
+    Returns:
+        Optional[InternInfo]: The statistics of the pool, None when interning is
+            disabled.
+    """
+    return _POOL.info() if _POOL else None
+
+
+def intern(value: str) -> str:
+    """
+    Args:
+        value (str): A string that a structure keeps.
+
+    Returns:
+        str: The pooled string when interning is enabled, otherwise the value.
+    """
+    return _POOL.intern(value) if _POOL else value
+
+
+def intern_all(values: Collection[str]) -> Collection[str]:
+    """
+    Args:
+        values (Collection[str]): Strings that a structure keeps.
+
+    Returns:
+        Collection[str]: A tuple of the pooled strings when interning is enabled,
+            otherwise the values as is.
+    """
+    if _POOL is None or not values:
+        return values
+    return tuple(map(_POOL.intern, values))
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+MANIFEST_FILE = ".codemate-manifest.json"
+
+
+def normalize_path(path: str) -> str:
+    """
+    Args:
+        path (str): A path relative to a directory, in the format of the OS or POSIX.
+
+    Returns:
+        str: The normalized path in POSIX format.
+
+    Raises:
+        ValueError: When the path is absolute or is outside the directory.
+    """
+    normalized = posixpath.normpath(path.replace(os.sep, "/"))
+    if (
+        posixpath.isabs(normalized)
+        or os.path.splitdrive(normalized)[0]
+        or normalized.split("/")[0] in ("..", ".")
+    ):
+        raise ValueError(f"The path {path!r} is outside the package directory")
+    return normalized
+
+
+def atomic_write(path: str, chunks: Iterable[str]) -> None:
+    """
+    Writes a text file through a temporary file that replaces the file when it's
+    complete, so the file is never partially written. An existing file keeps its
+    permissions, and a symbolic link keeps pointing to the written file.
+
+    Args:
+        path (str): The path of the file.
+        chunks (Iterable[str]): The content of the file.
+
+    Raises:
+        OSError: When the file can't be written.
+    """
+    path = os.path.realpath(path)
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    # The permissions are the ones that open() gives a new file, by the umask
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, "w", encoding="utf-8") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        try:
+            shutil.copymode(path, temp_path)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_file(path: str) -> Optional[str]:
+    """
+    Args:
+        path (str): The path of a text file.
+
+    Returns:
+        Optional[str]: The content of the file, None when it doesn't exist or can't be
+            read.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """
+    Writes a text file atomically unless it already has the given content, so the
+    modification time of an unchanged file is kept.
+
+    Args:
+        path (str): The path of the file.
+        content (str): The content of the file.
+
+    Returns:
+        bool: True when the file was written, False when it was unchanged.
+
+    Raises:
+        OSError: When the file can't be written.
+    """
+    if read_file(path) == content:
+        return False
+    atomic_write(path, (content,))
+    return True
+
+
+def _is_normalized(path: str) -> bool:
+    # The manifest records normalized paths, other paths were written by hand
+    try:
+        return normalize_path(path) == path
+    except ValueError:
+        return False
+
+
+def _hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """
+    Tracks the files that a generator writes in a directory, by a manifest file in the
+    directory. Unchanged files aren't written again, and the files that were written
+    by the previous generation and not by the current one can be removed.
+
+    A file is known to be unchanged without reading it, when its size and modification
+    time are the ones that were recorded in the manifest.
+
+    Args:
+        root (str): The directory of the generated files.
+        name (str): The name of the manifest file in the directory.
+    """
+
+    def __init__(self, root: str, name: str = MANIFEST_FILE) -> None:
+        self.root = root
+        self.path = os.path.join(root, name)
+        self._previous: Dict[str, Dict[str, Any]] = {}
+        self._current: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        content = read_file(self.path)
+        if content:
+            try:
+                self._previous = json.loads(content)["files"]
+            except (ValueError, KeyError, TypeError):
+                self._previous = {}
+
+    def write(self, path: str, content: str) -> bool:
+        """
+        Writes a generated file atomically unless it's unchanged, and records it.
+
+        Args:
+            path (str): The path of the file relative to the root directory.
+            content (str): The content of the file.
+
+        Returns:
+            bool: True when the file was written, False when it was unchanged.
+
+        Raises:
+            OSError: When the file can't be written.
+        """
+        full_path = os.path.join(self.root, path)
+        digest = _hash(content)
+        written = not self._is_unchanged(path, digest)
+        if written:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            written = write_if_changed(full_path, content)
+        stat = os.stat(full_path)
+        with self._lock:
+            self._current[path] = {
+                "sha256": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        return written
+
+    def remove_stale(self) -> List[str]:
+        """
+        Removes the files that were recorded by the previous manifest and weren't
+        written since the manifest was loaded. The directories are kept, and so are the
+        files that a changed manifest records outside the root directory.
+
+        Returns:
+            List[str]: The paths of the removed files, relative to the root directory.
+        """
+        stale = sorted(filter(_is_normalized, set(self._previous) - set(self._current)))
+        for path in stale:
+            try:
+                os.remove(os.path.join(self.root, path))
+            except FileNotFoundError:
+                pass
+        self._previous = {}
+        return stale
+
+    def save(self) -> None:
+        """
+        Saves the manifest of the written files, and of the files of the previous
+        manifest that weren't removed.
+
+        Raises:
+            OSError: When the manifest can't be written.
+        """
+        files = {**self._previous, **self._current}
+        content = json.dumps({"files": dict(sorted(files.items()))}, indent=1)
+        os.makedirs(self.root, exist_ok=True)
+        atomic_write(self.path, (content,))
+
+    def _is_unchanged(self, path: str, digest: str) -> bool:
+        entry = self._previous.get(path)
+        if not entry or entry.get("sha256") != digest:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.root, path))
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"])
@@ -14,6 +14,10 @@ class Method(Function):
         return_value (Optional[str]): The type of the function return value.
     """
 
+    __slots__ = ()
+
+    _BOUND_ARGUMENTS = ("self",)
+
     def __init__(
         self,
         name: str,
@@ -23,7 +27,7 @@ class Method(Function):
     ) -> None:
         super().__init__(
             name=name,
-            arguments=("self", *arguments),
+            arguments=(*self._BOUND_ARGUMENTS, *arguments),
             is_async=is_async,
             return_value=return_value,
         )
@@ -40,6 +44,10 @@ class ClassMethod(Function):
         return_value (Optional[str]): The type of the function return value.
     """
 
+    __slots__ = ()
+
+    _BOUND_ARGUMENTS = ("cls",)
+
     def __init__(
         self,
         name: str,
@@ -49,7 +57,7 @@ class ClassMethod(Function):
     ) -> None:
         super().__init__(
             name=name,
-            arguments=("cls", *arguments),
+            arguments=(*self._BOUND_ARGUMENTS, *arguments),
             is_async=is_async,
             return_value=return_value,
         )
@@ -67,6 +75,8 @@ class StaticMethod(Function):
         return_value (Optional[str]): The type of the function return value.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
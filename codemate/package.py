@@ -0,0 +1,191 @@
+import os
+import posixpath
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from codemate import validator
+from codemate.exceptions import PackageSaveError, SaveFileError
+from codemate.file import File
+from codemate.manifest import MANIFEST_FILE, Manifest, atomic_write, normalize_path
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+INIT_FILE = "__init__.py"
+
+
+def _format_syntax(syntax: str) -> str:
+    # Black is slow to import, the saves without it don't import the formatter
+    from codemate import formatter  # pylint: disable=import-outside-toplevel
+
+    return formatter.format_module(syntax, tree=validator.parse(syntax))
+
+
+def _write(root: str, path: str, content: str, manifest: Optional[Manifest]) -> bool:
+    try:
+        if manifest:
+            return manifest.write(path, content)
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        atomic_write(full_path, (content,))
+        return True
+    except OSError as error:
+        raise SaveFileError(f"Can't create the generated file {path}") from error
+
+
+class Package:
+    """
+    Creates a Python package of generated files.
+
+    The files are kept by their paths relative to the package directory, in POSIX
+    format. A package directory, and each directory that holds a file, gets an empty
+    `__init__.py` file when its first file is added, unless one was added before. The
+    created files are kept like the added ones, so they can be changed by `get_file`.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, File] = {}
+
+    def add_file(self, path: str, file: File) -> "Package":
+        """
+        Adds a file to the package, replacing the file that was added in the same path.
+
+        Args:
+            path (str): The path of the file relative to the package directory,
+                for example "api/client.py".
+            file (File): The generated file.
+
+        Returns:
+            Package: The package instance.
+
+        Raises:
+            ValueError: When the path is absolute or is outside the package directory.
+        """
+        path = normalize_path(path)
+        self._files[path] = file
+        directory = posixpath.dirname(path)
+        while True:
+            self._files.setdefault(
+                posixpath.join(directory, INIT_FILE), File(header=None)
+            )
+            if not directory:
+                break
+            directory = posixpath.dirname(directory)
+        return self
+
+    def get_file(self, path: str) -> File:
+        """
+        Args:
+            path (str): The path of the file relative to the package directory.
+
+        Returns:
+            File: The file in the given path, including the created `__init__.py` files.
+
+        Raises:
+            KeyError: When the package doesn't have a file in the given path.
+        """
+        return self._files[normalize_path(path)]
+
+    @property
+    def files(self) -> Dict[str, File]:
+        """
+        Dict[str, File]: The files of the package by their paths, including the created
+            `__init__.py` files, sorted by the paths.
+        """
+        return dict(sorted(self._files.items()))
+
+    def save(
+        self,
+        root: str,
+        use_black: bool = True,
+        jobs: int = 1,
+        incremental: bool = False,
+    ) -> List[str]:
+        """
+        Saves the package files in a given directory, the directories are created when
+        they don't exist. A file that fails doesn't stop the others from being saved.
+        Each file is written to a temporary file that replaces it when it's complete.
+
+        Args:
+            root (str): The package directory.
+            use_black (bool): When true black linter will be used to format the
+                generated Python code.
+            jobs (int): When more than 1, the files are validated and formatted by a pool
+                of processes of the given size and written by a pool of threads.
+            incremental (bool): When true the unchanged files aren't written and the
+                files of the previous save that the package no longer has are removed,
+                by a `Manifest` in the package directory.
+
+        Returns:
+            List[str]: The paths of the written files.
+
+        Raises:
+            PackageSaveError: When some of the files can't be created, it holds the
+                error of each file.
+        """
+        manifest = Manifest(root) if incremental else None
+        write = partial(_write, root, manifest=manifest)
+        syntaxes = {path: file.syntax() for path, file in self.files.items()}
+        written: Dict[str, bool] = {}
+        errors: Dict[str, Exception] = {}
+        if jobs <= 1:
+            for path, syntax in syntaxes.items():
+                try:
+                    content = _format_syntax(syntax) if use_black else syntax
+                    written[path] = write(path, content)
+                except Exception as error:  # pylint: disable=broad-except
+                    errors[path] = error
+        else:
+            self._save_concurrently(
+                write, syntaxes, use_black, jobs, written=written, errors=errors
+            )
+        if manifest:
+            # The failed files are kept since they are still generated by the package
+            if not errors:
+                manifest.remove_stale()
+            try:
+                manifest.save()
+            except OSError as error:
+                errors[MANIFEST_FILE] = SaveFileError("Can't create the manifest file")
+                errors[MANIFEST_FILE].__cause__ = error
+        if errors:
+            raise PackageSaveError(errors)
+        return [path for path, changed in written.items() if changed]
+
+    @staticmethod
+    def _save_concurrently(  # pylint: disable=too-many-arguments,too-many-locals
+        write: Callable[[str, str], bool],
+        syntaxes: Dict[str, str],
+        use_black: bool,
+        jobs: int,
+        *,
+        written: Dict[str, bool],
+        errors: Dict[str, Exception],
+    ) -> None:
+        # The pools are imported only for concurrent saves
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        writes: Dict[str, "Future[bool]"] = {}
+        with ThreadPoolExecutor(jobs) as threads:
+            if use_black:
+                with ProcessPoolExecutor(jobs) as processes:
+                    formats = {
+                        path: processes.submit(_format_syntax, syntax)
+                        for path, syntax in syntaxes.items()
+                    }
+                    # The files are written while the next files are formatted
+                    for path, formatted in formats.items():
+                        try:
+                            syntax = formatted.result()
+                            writes[path] = threads.submit(write, path, syntax)
+                        except Exception as error:  # pylint: disable=broad-except
+                            errors[path] = error
+            else:
+                for path, syntax in syntaxes.items():
+                    writes[path] = threads.submit(write, path, syntax)
+        for path, future in writes.items():
+            try:
+                written[path] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                errors[path] = error
@@ -0,0 +1,149 @@
+import ast
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+from codemate import exceptions, validator
+from codemate.manifest import atomic_write, write_if_changed
+
+if TYPE_CHECKING:
+    from codemate.block import Block
+
+# The stages of the pipeline, in the order they are executed
+STAGES = ("render", "parse", "format", "write")
+
+
+class Pipeline:
+    """
+    Renders a block once, and shares the rendered syntax and the syntax tree that
+    validates it between the validation, the formatting and the writing of the block.
+
+    Each stage runs at most once, when its result is first needed, and the time it took
+    is kept in `timings`.
+
+    Args:
+        block (Block): The block that we want to render.
+        jobs (int): How many processes format the block by Black.
+
+    Attributes:
+        timings (Dict[str, float]): The seconds that each executed stage took, by the
+            names in `STAGES`.
+    """
+
+    def __init__(self, block: "Block", jobs: int = 1) -> None:
+        self.block = block
+        self.jobs = jobs
+        self.timings: Dict[str, float] = {}
+        self._syntax: Optional[str] = None
+        self._tree: Optional[ast.Module] = None
+        self._formatted: Optional[str] = None
+
+    @property
+    def syntax(self) -> str:
+        """
+        str: The block syntax.
+        """
+        if self._syntax is None:
+            with self._measure("render"):
+                self._syntax = self.block.syntax()
+        return self._syntax
+
+    @property
+    def tree(self) -> ast.Module:
+        """
+        ast.Module: The syntax tree of the block syntax.
+
+        Raises:
+            InputError: When the generated Python 3 code isn't valid.
+        """
+        if self._tree is None:
+            syntax = self.syntax
+            with self._measure("parse"):
+                self._tree = validator.parse(syntax)
+        return self._tree
+
+    def validate(self, raise_error: bool = True) -> bool:
+        """
+        Checks if the block syntax is Python 3 valid.
+
+        Args:
+            raise_error (bool): When True and the syntax is invalid, an exception will be
+                raised. When False and the syntax is invalid, False will be returned.
+
+        Returns:
+            bool: True when the syntax is valid, otherwise False.
+
+        Raises:
+            InputError: When the generated Python 3 code isn't valid.
+        """
+        try:
+            self.tree  # pylint: disable=pointless-statement
+        except exceptions.InputError:
+            if raise_error:
+                raise
+            return False
+        return True
+
+    def format(self) -> str:
+        """
+        Returns:
+            str: The block syntax formatted by Black.
+
+        Raises:
+            InputError: When the generated Python 3 code isn't valid.
+        """
+        if self._formatted is None:
+            # Imports Black, which is slow to import, only when formatting
+            from codemate import formatter  # pylint: disable=import-outside-toplevel
+
+            tree = self.tree
+            with self._measure("format"):
+                self._formatted = formatter.format_module(
+                    self.syntax, jobs=self.jobs, tree=tree
+                )
+        return self._formatted
+
+    def save(
+        self, path: str, use_black: bool = True, incremental: bool = False
+    ) -> bool:
+        """
+        Writes the block syntax to a temporary file that replaces the file when it's
+        complete. When the syntax isn't formatted and wasn't rendered yet, it's
+        streamed to the file and rendered in the write stage.
+
+        Args:
+            path (str): The path of the file.
+            use_black (bool): When true the syntax is formatted by Black.
+            incremental (bool): When true the file isn't written if it already has the
+                syntax, its modification time is kept.
+
+        Returns:
+            bool: True when the file was written, False when it was unchanged.
+
+        Raises:
+            InputError: When the syntax is formatted and the generated Python 3 code
+                isn't valid.
+            OSError: When the file can't be written.
+        """
+        if use_black:
+            content = self.format()
+        elif incremental or self._syntax is not None:
+            content = self.syntax
+        else:
+            with self._measure("write"):
+                atomic_write(path, self.block.iter_syntax())
+            return True
+        with self._measure("write"):
+            if incremental:
+                return write_if_changed(path, content)
+            atomic_write(path, (content,))
+        return True
+
+    @contextmanager
+    def _measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0)
+            self.timings[stage] += time.perf_counter() - start
@@ -0,0 +1,160 @@
+"""
+Profiling of the generation phases.
+
+While a `profile` context is open, the methods of the phases are wrapped and each call
+is recorded by the open profiles. When no profile is open the original methods are
+restored, so profiling costs nothing when it's disabled.
+
+The time of a phase includes the phases that it calls, for example `use_black` includes
+`syntax` and `format`.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from codemate.block import Block
+from codemate.file import File
+from codemate.pipeline import Pipeline
+
+# The profiled phases, by the class and the name of their method
+PHASES: Dict[str, Tuple[type, str]] = {
+    "parse_block": (Block, "parse_block"),
+    "format_imports": (Block, "_format_imports"),
+    "syntax": (Block, "syntax"),
+    "validate": (Block, "validate"),
+    "use_black": (Block, "use_black"),
+    # Formatting by Black, as part of use_black or of save
+    "format": (Pipeline, "format"),
+    "save": (File, "save"),
+}
+
+
+class PhaseStats(NamedTuple):
+    """
+    The statistics of a profiled phase.
+
+    Attributes:
+        calls (int): How many times the phase was called.
+        seconds (float): The cumulative wall time of the calls.
+        bytes (int): How many bytes the calls produced, the size of the returned syntax
+            or of the saved file.
+    """
+
+    calls: int
+    seconds: float
+    bytes: int
+
+
+class Profile:
+    """
+    Collects the statistics of the generation phases that were called while the
+    profile was open, use `profile` to open one.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, PhaseStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float, size: int) -> None:
+        """
+        Records a call of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+            seconds (float): The wall time of the call.
+            size (int): How many bytes the call produced.
+        """
+        with self._lock:
+            calls, total, produced = self._stats.get(phase, PhaseStats(0, 0.0, 0))
+            self._stats[phase] = PhaseStats(calls + 1, total + seconds, produced + size)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics of the called phases by their
+                names, each holds "calls", "seconds" and "bytes".
+        """
+        with self._lock:
+            return {phase: stats._asdict() for phase, stats in self._stats.items()}
+
+    def report(self) -> str:
+        """
+        Returns:
+            str: A table of the statistics of the called phases, the slowest first.
+        """
+        rows = [("phase", "calls", "seconds", "bytes")]
+        stats = sorted(self.as_dict().items(), key=lambda item: -item[1]["seconds"])
+        for phase, values in stats:
+            calls, seconds, size = values.values()
+            rows.append((phase, str(calls), f"{seconds:.6f}", str(size)))
+        return "\n".join("".join(cell.rjust(16) for cell in row) for row in rows)
+
+
+_LOCK = threading.Lock()
+_PROFILES: List[Profile] = []
+_ORIGINALS: Dict[str, Callable[..., Any]] = {}
+
+
+def _measure(
+    phase: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], result: Any
+) -> int:
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    if phase == "save" and result:
+        path = kwargs["path"] if "path" in kwargs else args[1]
+        return os.path.getsize(path)
+    return 0
+
+
+def _instrument(phase: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = None
+        try:
+            result = method(*args, **kwargs)
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            size = _measure(phase, args, kwargs, result)
+            for profile_ in tuple(_PROFILES):
+                profile_.record(phase, seconds, size)
+
+    return wrapper
+
+
+def _install() -> None:
+    for phase, (owner, name) in PHASES.items():
+        _ORIGINALS[phase] = vars(owner)[name]
+        setattr(owner, name, _instrument(phase, _ORIGINALS[phase]))
+
+
+def _uninstall() -> None:
+    for phase, (owner, name) in PHASES.items():
+        setattr(owner, name, _ORIGINALS.pop(phase))
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Profiles the generation phases that are called in the context, in all the threads.
+    Profiles may be nested, each one records the calls while it's open.
+
+    Yields:
+        Profile: The statistics of the phases, they are updated until the context exits.
+    """
+    result = Profile()
+    with _LOCK:
+        if not _PROFILES:
+            _install()
+        _PROFILES.append(result)
+    try:
+        yield result
+    finally:
+        with _LOCK:
+            _PROFILES.remove(result)
+            if not _PROFILES:
+                _uninstall()
@@ -0,0 +1,215 @@
+from typing import List, NamedTuple, Tuple
+
+
+class Fragment(NamedTuple):
+    """
+    The rendered syntax of a block that was written inside another block, it can be
+    written again without rendering the block.
+
+    Attributes:
+        lead (int): How many new lines were written before the first line.
+        chunks (List[str]): The emitted chunks, the indentation is already applied.
+        trail (int): How many new lines were written after the last line.
+    """
+
+    lead: int
+    chunks: List[str]
+    trail: int
+
+
+class Renderer:  # pylint: disable=too-many-instance-attributes
+    """
+    Collects the generated Python syntax of a block tree in a single pass.
+
+    The blocks write their content into the renderer, the indentation is applied once,
+    when a line is emitted, and the output is kept as a list of chunks that is joined
+    only when the syntax is requested. New lines are buffered until the next line is
+    emitted, which allows sections to drop their leading and trailing new lines, as
+    `str.strip("\\n")` does, without copying the content that was already emitted.
+
+    The emitted chunks may be drained while rendering, which allows streaming the syntax
+    without holding all of it in memory.
+
+    Inserted blocks are rendered in frames, a frame adds indentation to the lines that
+    are written in it and captures them as a `Fragment` that can be replayed later.
+
+    Args:
+        memoize (bool): Whether the inserted blocks should keep their fragments.
+    """
+
+    def __init__(self, memoize: bool = True) -> None:
+        self.memoize = memoize
+        # The indentation of the current frame
+        self.prefix = ""
+        self._chunks: List[str] = []
+        # How many lines were emitted, it is not affected by draining the chunks
+        self._emitted = 0
+        # New lines that were written but not emitted yet
+        self._pending = 0
+        # When True, new lines are dropped until the next line is emitted
+        self._strip = False
+        self._sections: List[Tuple[int, int, bool]] = []
+        self._frames: List[Tuple[str, int, bool, int]] = []
+
+    def write(self, text: str, prefix: str = "") -> None:
+        """
+        Writes a text that may contain multiple lines.
+
+        Args:
+            text (str): The text that we want to write.
+            prefix (str): A string that is added before each non-empty line of the text.
+        """
+        prefix = self.prefix + prefix
+        if "\n" not in text:
+            if text:
+                self._emit(prefix + text)
+            return
+        lines = iter(text.split("\n"))
+        line = next(lines)
+        if line:
+            self._emit(prefix + line)
+        for line in lines:
+            self.new_line()
+            if line:
+                self._emit(prefix + line)
+
+    def new_line(self) -> None:
+        """
+        Writes a new line, the new line is emitted only when it is followed by a line.
+        """
+        if not self._strip:
+            self._pending += 1
+
+    def open_section(self) -> None:
+        """
+        Opens a section that its leading and trailing new lines are dropped.
+        """
+        self._sections.append((self._emitted, self._pending, self._strip))
+        self._strip = True
+
+    def close_section(self) -> None:
+        """
+        Closes the last opened section and drops its trailing new lines.
+        """
+        emitted, pending, strip = self._sections.pop()
+        if self._emitted == emitted:
+            # Nothing was emitted, the section was empty or contained new lines only
+            self._pending = pending
+            self._strip = strip
+        else:
+            self._pending = 0
+
+    def open_frame(self, prefix: str) -> None:
+        """
+        Opens a frame, the content of the frame is rendered as a standalone syntax.
+
+        Args:
+            prefix (str): A string that is added before each non-empty line of the frame.
+        """
+        self._frames.append(
+            (self.prefix, self._pending, self._strip, len(self._chunks))
+        )
+        # A placeholder for the new lines that are written before the frame
+        self._chunks.append("")
+        self.prefix += prefix
+        self._pending = 0
+        self._strip = False
+
+    def close_frame(self) -> Fragment:
+        """
+        Closes the last opened frame, the frame content is merged with the content that
+        was written before it.
+
+        Returns:
+            Fragment: The captured content of the frame.
+        """
+        prefix, pending, strip, index = self._frames.pop()
+        self.prefix = prefix
+        chunks = self._chunks
+        if len(chunks) == index + 1:
+            # Nothing was emitted, the frame contained new lines only
+            chunks.pop()
+            fragment = Fragment(self._pending, [], 0)
+            self._pending = pending + (0 if strip else fragment.lead)
+            self._strip = strip
+            return fragment
+        # The new lines before the first line are merged into the placeholder
+        lead = 0
+        start = index + 1
+        while not chunks[start] or chunks[start][0] == "\n":
+            lead += len(chunks[start])
+            chunks[start] = ""
+            start += 1
+        fragment = Fragment(lead, chunks[start:], self._pending)
+        chunks[index] = "\n" * (pending + (0 if strip else lead))
+        self._strip = False
+        return fragment
+
+    def replay(self, fragment: Fragment) -> None:
+        """
+        Writes a fragment that was captured by a frame with the same indentation.
+
+        Args:
+            fragment (Fragment): The fragment that we want to write.
+        """
+        if not fragment.chunks:
+            if not self._strip:
+                self._pending += fragment.lead
+            return
+        new_lines = self._pending + (0 if self._strip else fragment.lead)
+        if new_lines:
+            self._chunks.append("\n" * new_lines)
+        self._chunks.extend(fragment.chunks)
+        self._emitted += 1
+        self._strip = False
+        self._pending = fragment.trail
+
+    def tell(self) -> Tuple[int, int]:
+        """
+        Returns:
+            Tuple[int, int]: A marker of the current position, markers of different
+                positions are not equal.
+        """
+        return self._emitted, self._pending
+
+    @property
+    def ends_with_new_line(self) -> bool:
+        """
+        bool: Whether the last written character is a new line.
+        """
+        return self._pending > 0
+
+    @property
+    def buffered(self) -> int:
+        """
+        int: How many chunks are waiting to be drained.
+        """
+        return len(self._chunks)
+
+    def drain(self) -> str:
+        """
+        Removes the emitted chunks from the renderer, the buffered new lines are kept
+        since they may be dropped by a section. Must not be called inside a frame.
+
+        Returns:
+            str: The syntax that was emitted since the last drain.
+        """
+        syntax = "".join(self._chunks)
+        self._chunks.clear()
+        return syntax
+
+    def getvalue(self) -> str:
+        """
+        Returns:
+            str: The written syntax since the last drain, including the buffered new
+                lines.
+        """
+        return "".join(self._chunks) + "\n" * self._pending
+
+    def _emit(self, line: str) -> None:
+        if self._pending:
+            self._chunks.append("\n" * self._pending)
+            self._pending = 0
+        self._strip = False
+        self._emitted += 1
+        self._chunks.append(line)
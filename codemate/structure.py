@@ -1,9 +1,14 @@
 from abc import abstractmethod
 from collections import Counter
 from functools import partial
-from typing import Collection, List, Optional
+from typing import Any, Collection, Iterator, Optional, Sequence, Tuple, TypeVar
 
+from codemate import validator
 from codemate.block import Block
+from codemate.interning import intern, intern_all
+from codemate.renderer import Renderer
+
+_Structure = TypeVar("_Structure", bound="Structure")
 
 
 class Structure(Block):
@@ -14,13 +19,15 @@ class Structure(Block):
         name(str): The name of the structure.
     """
 
+    __slots__ = ("_name", "_decorators")
+
     def __init__(
         self,
         name: str,
     ) -> None:
         super().__init__()
         self._name = name
-        self._decorators: List[str] = []
+        self._decorators: Sequence[str] = ()
 
     def add_decorator(self, line: str) -> "Structure":
         """
@@ -33,9 +40,54 @@ class Structure(Block):
         Returns:
             Class: The class instance.
         """
-        self._decorators.append(f"@{line}")
+        if not isinstance(self._decorators, list):
+            self._decorators = list(self._decorators)
+        self._decorators.append(intern(f"@{line}"))
+        self._update_index(lines=(self._decorators[-1],))
+        self._invalidate()
         return self
 
+    def clone(self: _Structure, **overrides: Any) -> _Structure:
+        """
+        Copies the structure, to stamp out structures that differ only by their
+        signatures. The copy shares the docs, imports, lines and decorators of this
+        structure until either of them changes, and the lazily inserted blocks are
+        shared as if they were inserted into both structures.
+
+        Args:
+            **overrides (Any): Arguments of the constructor that the copy should have
+                instead of the arguments of this structure, for example `name`.
+
+        Returns:
+            Structure: The copy of the structure.
+
+        Raises:
+            TypeError: When an override isn't an argument of the constructor.
+        """
+        clone = self._copy()
+        for key, value in overrides.items():
+            clone._override(key, value)  # pylint: disable=protected-access
+        return clone
+
+    def _override(self, key: str, value: Any) -> None:
+        """
+        Args:
+            key (str): The name of an argument of the constructor.
+            value (Any): The value that the structure should have instead.
+
+        Raises:
+            TypeError: When the key isn't an argument of the constructor.
+        """
+        if key != "name":
+            class_name = type(self).__name__
+            error = f"{class_name}.clone() got an unexpected keyword argument {key!r}"
+            raise TypeError(error)
+        self._name = value
+
+    def _share(self) -> None:
+        super()._share()
+        self._decorators = tuple(self._decorators)
+
     def _format_decorators(self, indent: int) -> str:
         format_line = partial(self.parse_block, new_line=1, indent=indent)
         syntax = "".join(format_line(line) for line in self._decorators)
@@ -45,26 +97,44 @@ class Structure(Block):
     def _format_signature(self, indent: int) -> str:
         raise NotImplementedError
 
-    def syntax(self, indent: int = 0, imports: bool = True) -> str:
-        """
-        Convert the structure to Python syntax.
+    def _structure_name(self) -> Optional[str]:
+        return self._name
 
-        Args:
-            indent (int): How much to indent the class content.
-            imports (bool): Whether to add imports or not.
+    def _iter_index_lines(self) -> Iterator[str]:
+        yield from self._decorators
+        yield self._format_signature(0)
+        yield from super()._iter_index_lines()
 
-        Returns:
-            str: The structure Python syntax.
-        """
-        syntax = ""
+    def _iter_hash_parts(self) -> Iterator[str]:
+        yield f"decorators {len(self._decorators)}"
+        yield from self._decorators
+        yield self._format_signature(0)
+        yield from super()._iter_hash_parts()
+
+    def _contains(self, value: str, indent: int = 0) -> bool:
+        return super()._contains(value, indent + 1)
+
+    def _iter_render(
+        self, renderer: Renderer, indent: int, imports: bool
+    ) -> Iterator[None]:
         if self._decorators:
-            syntax += self._format_decorators(indent)
-            syntax += "\n"
-        syntax += self._format_signature(indent)
-        block_content = super().syntax(indent + 1, imports)
-        syntax += "\n"
-        syntax += self.parse_block(block_content)
-        return syntax
+            renderer.write(self._format_decorators(indent))
+            renderer.new_line()
+        renderer.write(self._format_signature(indent))
+        renderer.new_line()
+        yield from super()._iter_render(renderer, indent + 1, imports)
+
+    def _parse_parts(self, prefix: str, imports: bool) -> Optional[int]:
+        if not super()._parse_parts(prefix + self._indentation, imports):
+            return None
+        # The signature is parsed with a placeholder body
+        lines = (
+            *self._decorators,
+            self._format_signature(0),
+            self._indentation + "...",
+        )
+        nodes = validator.parse_part(lines, prefix)
+        return 1 if nodes and len(nodes) == 1 else None
 
 
 class Function(Structure):
@@ -78,6 +148,11 @@ class Function(Structure):
         return_value (Optional[str]): The type of the function return value.
     """
 
+    __slots__ = ("_arguments", "_is_async", "_return_value")
+
+    # The arguments that the constructor adds before the given arguments
+    _BOUND_ARGUMENTS: Tuple[str, ...] = ()
+
     def __init__(
         self,
         name: str,
@@ -86,9 +161,19 @@ class Function(Structure):
         return_value: Optional[str] = None,
     ) -> None:
         super().__init__(name)
-        self._arguments = arguments
+        self._arguments = intern_all(arguments)
         self._is_async = is_async
-        self._return_value = return_value
+        self._return_value = return_value and intern(return_value)
+
+    def _override(self, key: str, value: Any) -> None:
+        if key == "arguments":
+            self._arguments = intern_all((*self._BOUND_ARGUMENTS, *value))
+        elif key == "is_async":
+            self._is_async = value
+        elif key == "return_value":
+            self._return_value = value and intern(value)
+        else:
+            super()._override(key, value)
 
     def _format_signature(self, indent: int) -> str:
         # Counter is used to remove duplications of arguments
@@ -108,6 +193,8 @@ class Class(Structure):
         inherit (Collection[str]): The classes that this class inherits from.
     """
 
+    __slots__ = ("_metaclass", "_inherit")
+
     def __init__(
         self,
         name: str,
@@ -115,8 +202,16 @@ class Class(Structure):
         inherit: Collection[str] = (),
     ) -> None:
         super().__init__(name)
-        self._metaclass = metaclass
-        self._inherit = inherit
+        self._metaclass = metaclass and intern(metaclass)
+        self._inherit = intern_all(inherit)
+
+    def _override(self, key: str, value: Any) -> None:
+        if key == "metaclass":
+            self._metaclass = value and intern(value)
+        elif key == "inherit":
+            self._inherit = intern_all(value)
+        else:
+            super()._override(key, value)
 
     def _format_signature(self, indent: int) -> str:
         signature = f"class {self._name}"
@@ -0,0 +1,283 @@
+"""
+Templates of structures that are generated many times with different values.
+
+A template is defined once by a function or a class whose syntax holds placeholders,
+`$name` or `${name}` as in `string.Template`, and `$$` for a dollar sign. The syntax of
+the structure is compiled into fragments, for each indentation that it's rendered in,
+and the instances are rendered by joining the fragments and the values of the instance,
+without parsing or formatting lines again.
+"""
+import re
+from string import Template as StringTemplate
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from codemate import validator
+from codemate.block import Block
+from codemate.renderer import Fragment, Renderer
+from codemate.structure import Structure
+
+_PLACEHOLDER = re.compile(StringTemplate.pattern.pattern, re.VERBOSE | re.IGNORECASE)
+
+
+class _Compiled(NamedTuple):
+    """
+    A syntax of a template, compiled for a single indentation.
+
+    Attributes:
+        syntax (str): A format string of the syntax, its fields are the positions of
+            the values in the parameters of the template.
+        trail (int): How many new lines end the syntax, they aren't part of it.
+    """
+
+    syntax: str
+    trail: int
+
+
+class Template:
+    """
+    A function or a class that is compiled once and instantiated many times, with the
+    values of its placeholders.
+
+    The template keeps a copy of the structure, the blocks that were inserted into it
+    lazily are rendered into the copy, so later changes of the structure and of those
+    blocks don't change the template. The imports are shared by the instances, so they
+    can't hold placeholders. The values are written as is, a value shouldn't span
+    lines.
+
+    Args:
+        structure (Structure): The structure, its syntax and name may hold placeholders.
+
+    Raises:
+        ValueError: When the imports of the structure hold placeholders.
+    """
+
+    def __init__(self, structure: Structure) -> None:
+        # pylint: disable=protected-access
+        self._prototype = _snapshot(structure)
+        self._imports = self._prototype._collect_imports()
+        if any(_PLACEHOLDER.search(import_) for import_ in self._imports):
+            raise ValueError("The imports of a template can't hold placeholders")
+        self._positions: Dict[str, int] = {}
+        self._name = self._compile(self._prototype._name)
+        self._signature = self._compile(self._prototype._format_signature(0))
+        self._compiled: Dict[Union[str, Tuple[int, bool]], _Compiled] = {}
+        self._get_compiled("")
+
+    @property
+    def parameters(self) -> Tuple[str, ...]:
+        """
+        Tuple[str, ...]: The names of the placeholders, in the order they appear.
+        """
+        return tuple(self._positions)
+
+    def instantiate(self, **values: str) -> "TemplateInstance":
+        """
+        Args:
+            **values (str): The values of the placeholders, by their names.
+
+        Returns:
+            TemplateInstance: A structure that is rendered as the template with the
+                values instead of the placeholders.
+
+        Raises:
+            KeyError: When a value of a placeholder is missing.
+        """
+        return TemplateInstance(self, tuple(map(values.__getitem__, self._positions)))
+
+    def _compile(self, syntax: str) -> str:
+        """
+        Args:
+            syntax (str): A syntax that may hold placeholders.
+
+        Returns:
+            str: A format string of the syntax, the new placeholders are added to the
+                parameters of the template.
+        """
+        parts: List[str] = []
+        start = 0
+        for match in _PLACEHOLDER.finditer(syntax):
+            parts.append(_escape(syntax[start : match.start()]))
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                # An escaped dollar sign, or a dollar sign that isn't a placeholder
+                parts.append("$")
+            else:
+                position = self._positions.setdefault(name, len(self._positions))
+                parts.append(f"{{{position}}}")
+            start = match.end()
+        parts.append(_escape(syntax[start:]))
+        return "".join(parts)
+
+    def _get_compiled(self, key: Union[str, Tuple[int, bool]]) -> _Compiled:
+        """
+        Args:
+            key (Union[str, Tuple[int, bool]]): The indentation prefix of a lazily
+                inserted instance, or the indentation and the imports flag of a
+                standalone syntax.
+
+        Returns:
+            _Compiled: The syntax of the template, compiled for the key.
+        """
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if isinstance(key, str):
+                syntax = self._prototype.syntax(imports=False)
+                syntax = "\n".join(
+                    key + line if line else line for line in syntax.split("\n")
+                )
+            else:
+                indent, imports = key
+                syntax = self._prototype.syntax(indent, imports)
+            content = syntax.rstrip("\n")
+            compiled = _Compiled(self._compile(content), len(syntax) - len(content))
+            self._compiled[key] = compiled
+        return compiled
+
+
+def _snapshot(structure: Structure) -> Structure:
+    """
+    Returns:
+        Structure: A copy of the structure, with the syntax of the blocks that were
+            inserted into it lazily instead of the blocks, as if they were inserted
+            when the copy was made.
+    """
+    # pylint: disable=protected-access
+    snapshot = structure.clone()
+    lines = snapshot._own_lines()
+    for position, line in enumerate(lines):
+        if isinstance(line, Block):
+            line._detach(snapshot)
+            snapshot._add_imports(line._collect_imports())
+            lines[position] = line.syntax(imports=False)
+    return snapshot
+
+
+def _escape(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
+
+class TemplateInstance(Structure):  # pylint: disable=too-many-instance-attributes
+    """
+    A structure that is rendered from a template with the values of its placeholders.
+    The instances can be inserted into other blocks like any structure, but they can't
+    be changed, changes are made in the template. `clone` accepts the values of the
+    placeholders as overrides.
+
+    Args:
+        template (Template): The template of the instance.
+        values (Sequence[str]): The values of the parameters of the template, in order.
+    """
+
+    __slots__ = ("_template", "_values")
+
+    def __init__(self, template: Template, values: Sequence[str]) -> None:
+        # pylint: disable=protected-access
+        super().__init__(template._name.format(*values))
+        prototype = template._prototype
+        self._indentation = prototype._indentation
+        self._imports = template._imports
+        self._import_sorter = prototype._import_sorter
+        self._template = template
+        self._values = tuple(values)
+
+    def _reject(self, *args: Any, **kwargs: Any) -> NoReturn:
+        """
+        Raises:
+            TypeError: Always, the instances are changed by changing their template.
+        """
+        raise TypeError("A template instance can't be changed, change the template")
+
+    # The changes are rejected before anything is changed
+    add_doc_line = add_import = add_specific_import = set_import_sorter = _reject
+    add_syntax_line = extend = insert = replace_structure = remove_structure = _reject
+    add_decorator = _reject
+
+    def _format_signature(self, indent: int) -> str:
+        # pylint: disable=protected-access
+        signature = self._template._signature.format(*self._values)
+        return self.parse_block(signature, indent=indent)
+
+    def _text(self, prefix: str) -> str:
+        """
+        Args:
+            prefix (str): The indentation of the instance.
+
+        Returns:
+            str: The syntax of the instance, without the new lines that end it.
+        """
+        compiled = self._template._get_compiled(prefix)  # pylint: disable=W0212
+        return compiled.syntax.format(*self._values)
+
+    def _override(self, key: str, value: Any) -> None:
+        # pylint: disable=protected-access
+        position = self._template._positions.get(key)
+        if position is None:
+            class_name = type(self).__name__
+            error = f"{class_name}.clone() got an unexpected keyword argument {key!r}"
+            raise TypeError(error)
+        values = list(self._values)
+        values[position] = value
+        self._values = tuple(values)
+        self._name = self._template._name.format(*values)
+
+    def _attach(self, parent: Block) -> None:
+        # An instance doesn't contain other blocks, so it can't contain the parent
+        self._add_parent(parent)
+
+    def _update_index(
+        self,
+        lines: Collection[str] = (),
+        imports: Collection[str] = (),
+        blocks: Collection[Block] = (),
+    ) -> None:
+        self._reject()
+
+    def _invalidate(self) -> None:
+        # Every change of a block ends by invalidating its rendered syntax
+        self._reject()
+
+    def _collect_imports(self) -> FrozenSet[str]:
+        return self._imports  # type: ignore
+
+    def _iter_index_lines(self) -> Iterator[str]:
+        yield from self._text("").split("\n")
+
+    def _iter_hash_parts(self) -> Iterator[str]:
+        yield f"imports {len(self._imports)}"
+        yield from sorted(self._imports)
+        yield self._text("")
+
+    def _iter_render(
+        self, renderer: Renderer, indent: int, imports: bool
+    ) -> Iterator[None]:
+        # pylint: disable=protected-access
+        compiled = self._template._get_compiled((indent, imports))
+        yield
+        renderer.write(compiled.syntax.format(*self._values))
+        renderer.write("\n" * compiled.trail)
+
+    def _render_inserted(self, renderer: Renderer, prefix: str) -> None:
+        key = renderer.prefix + prefix
+        compiled = self._template._get_compiled(key)  # pylint: disable=W0212
+        syntax = compiled.syntax.format(*self._values)
+        renderer.replay(Fragment(0, [syntax], compiled.trail))
+
+    def _parse_parts(self, prefix: str, imports: bool) -> Optional[int]:
+        if imports and self._imports:
+            # The imports are sorted with the syntax, so it's parsed as a whole
+            return None
+        statements = validator.parse_part((self._text(""),), prefix)
+        return None if statements is None else len(statements)
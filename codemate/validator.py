@@ -1,12 +1,18 @@
 import ast
+from typing import Iterable, List, Optional, cast
 
-from codemate.exceptions import InputError
+from codemate import exceptions
+from codemate.cache import LRUCache
 
 ERROR_CONTEXT_PADDING = 2
 ERROR_POST_FIX = "   <-- 🔍 seems the error is around here"
 
+# The statements of the parsed parts, by the part syntax and its indentation.
+# Shared by all the blocks, use PARTS_CACHE.info() to get its statistics.
+PARTS_CACHE: LRUCache[List[ast.stmt]] = LRUCache(maxsize=4096)
 
-def _format_error(syntax: str, error: SyntaxError) -> InputError:
+
+def _format_error(syntax: str, error: SyntaxError) -> "exceptions.InputError":
     if error.lineno is None:
         raise ValueError("SyntaxError.lineno can not contain None")
     lines = syntax.split("\n")
@@ -18,12 +24,75 @@ def _format_error(syntax: str, error: SyntaxError) -> InputError:
     lines[exc_index] = lines[exc_index] + ERROR_POST_FIX
     err_lines = "\n".join(lines[start:end])
     exc_name = getattr(type(error), "__name__", "SyntaxError")
-    return InputError(
+    return exceptions.InputError(
         f"Caused by {exc_name} in line-{error.lineno} column-{error.offset}:"
         f"\n{err_lines}"
     )
 
 
+def parse(syntax: str) -> ast.Module:
+    """
+    Parses a given Python 3 syntax, the syntax tree can be reused by the consumers of
+    the syntax instead of parsing it again.
+
+    Args:
+        syntax (str): Python 3 syntax.
+
+    Returns:
+        ast.Module: The syntax tree.
+
+    Raises:
+        InputError: When the given Python 3 syntax isn't valid.
+    """
+    try:
+        return ast.parse(syntax)
+    except SyntaxError as exception:
+        if not exception.lineno:
+            raise exceptions.InputError(
+                "The syntax structure is not Python 3 valid"
+            ) from exception
+        error = _format_error(syntax, exception)
+    raise error from None
+
+
+def parse_part(lines: Iterable[str], prefix: str = "") -> Optional[List[ast.stmt]]:
+    """
+    Parses a part of a syntax on its own, the non-empty lines are indented by a prefix
+    as they are in the whole syntax so the parsed strings are equal, and the leading and
+    trailing empty lines are dropped as the renderer drops them. A part with the
+    same content and indentation as a part that was parsed before isn't parsed again,
+    the statements are shared, copy them before changing them.
+
+    Args:
+        lines (Iterable[str]): The lines of the part, a line may hold multiple lines.
+        prefix (str): The indentation of the part in the whole syntax.
+
+    Returns:
+        Optional[List[ast.stmt]]: The statements of the part, None when the part can't
+            be parsed on its own.
+    """
+    # A line continuation before a dropped empty line continues the next part
+    syntax = "\n".join(lines).strip("\n")
+    key = (syntax, prefix)
+    statements = PARTS_CACHE.get(key)
+    if statements is not None:
+        return statements
+    if prefix:
+        lines = syntax.split("\n")
+        syntax = "\n".join(prefix + line if line else line for line in lines)
+        # Parsed as the body of a block, the last statement allows parts without any
+        syntax = f"if 1:\n{syntax}\n{prefix}pass"
+    try:
+        tree = ast.parse(syntax)
+    except (SyntaxError, ValueError):
+        return None
+    statements = tree.body
+    if prefix:
+        statements = cast(ast.If, statements[0]).body[:-1]
+    PARTS_CACHE.set(key, statements)
+    return statements
+
+
 def validate(syntax: str, raise_error: bool = False) -> bool:
     """
     Checks if a given Python 3 syntax is valid.
@@ -42,16 +111,11 @@ def validate(syntax: str, raise_error: bool = False) -> bool:
     Raises:
         InputError: When the given Python 3 syntax isn't valid.
     """
+    if raise_error:
+        parse(syntax)
+        return True
     try:
         ast.parse(syntax)
-    except SyntaxError as exception:
-        if raise_error is False:
-            return False
-        if not exception.lineno:
-            raise InputError(
-                "The syntax structure is not Python 3 valid"
-            ) from exception
-        error = _format_error(syntax, exception)
-        if raise_error:
-            raise error from None
+    except SyntaxError:
+        return False
     return True
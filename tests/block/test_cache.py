@@ -0,0 +1,126 @@
+# pylint: disable=missing-function-docstring,protected-access
+import isort
+
+from codemate import Block, Class, File, Function, Method
+from codemate import block as block_module
+from codemate.cache import LRUCache
+from tests import examples
+
+
+def _count_renders(monkeypatch) -> list:
+    calls = []
+    render = Block._render
+
+    def counted_render(self, renderer, indent, imports):
+        calls.append(self)
+        render(self, renderer, indent, imports)
+
+    monkeypatch.setattr(Block, "_render", counted_render)
+    return calls
+
+
+def test_repeated_queries(monkeypatch):
+    calls = _count_renders(monkeypatch)
+    block = examples.block.get_example()
+    syntax = block.syntax()
+    assert syntax is block.syntax()
+    assert str(block) is syntax
+    assert "LOGGER" in block
+    block.validate()
+    block.use_black()
+    assert len(calls) == 1
+    block.syntax(indent=1)
+    block.syntax(imports=False)
+    assert len(calls) == 3
+
+
+def test_invalidation():
+    block = Block()
+    block.add_syntax_line("x = 1")
+    assert block.syntax() == "x = 1\n"
+    block.add_syntax_line("y = 2")
+    assert block.syntax() == "x = 1\ny = 2\n"
+    block.add_doc_line("Docs")
+    assert block.syntax().startswith('"""\nDocs\n"""\n')
+    block.add_import("math")
+    assert "import math\n" in block.syntax()
+    block.add_specific_import("os", "path")
+    assert "from os import path\n" in block.syntax()
+    other = Block()
+    other.add_syntax_line("z = 3")
+    block.extend(other)
+    assert block.syntax().endswith("z = 3\n")
+    block.insert(Function("f"))
+    assert block.syntax().endswith("def f():\n")
+
+
+def test_decorator_invalidation():
+    function = Function("f")
+    function.add_syntax_line("pass")
+    assert function.syntax() == "def f():\n    pass\n"
+    function.add_decorator("timer")
+    assert function.syntax() == "@timer\ndef f():\n    pass\n"
+
+
+def test_lazy_path_invalidation(monkeypatch):
+    file = File(header=None)
+    class_ = Class("Client")
+    file.insert(class_, lazy=True)
+    methods = [Method(f"get_{i}", return_value="int") for i in range(10)]
+    for method in methods:
+        method.add_specific_import("typing", "List")
+        method.add_syntax_line("return 1")
+        class_.insert(method, lazy=True)
+    syntax = file.syntax()
+    assert syntax.startswith("from typing import List\n\nclass Client:\n")
+    calls = _count_renders(monkeypatch)
+    methods[3].add_syntax_line("return 2")
+    assert file.syntax() == syntax.replace(
+        "        return 1\n\n    def get_4",
+        "        return 1\n        return 2\n\n    def get_4",
+    )
+    assert calls == [file, class_, methods[3]]
+
+
+def test_imports_cache(monkeypatch):
+    calls = []
+    code = isort.code
+
+    def counted_code(*args, **kwargs):
+        calls.append(args)
+        return code(*args, **kwargs)
+
+    monkeypatch.setattr(isort, "code", counted_code)
+    monkeypatch.setattr(block_module, "IMPORTS_CACHE", LRUCache(maxsize=2))
+    methods = []
+    for index in range(10):
+        method = Method(f"get_{index}")
+        method.add_specific_import("typing", "List", "Dict")
+        method.add_import("os")
+        methods.append(method)
+    syntaxes = {method.syntax() for method in methods}
+    assert len(syntaxes) == 10
+    assert len(calls) == 1
+    info = block_module.IMPORTS_CACHE.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (9, 1, 0, 1)
+    methods[0].syntax(indent=1)
+    Function("other").add_import("sys").syntax()
+    assert len(calls) == 3
+    assert block_module.IMPORTS_CACHE.info().evictions == 1
+    block_module.IMPORTS_CACHE.clear()
+    assert block_module.IMPORTS_CACHE.info() == (0, 0, 0, 2, 0)
+
+
+def test_lru_cache():
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    cache.maxsize = 1
+    assert "c" not in cache
+    assert len(cache) == 1
+    assert cache.info() == (2, 1, 2, 1, 1)
@@ -0,0 +1,111 @@
+# pylint: disable=missing-function-docstring
+import pytest
+
+from codemate import Block, Class, File, Function, Method
+from tests import examples
+
+EXAMPLES = (
+    examples.block,
+    examples.function,
+    examples.class_,
+    examples.method,
+    examples.file,
+)
+
+
+def _values(syntax: str):
+    for line in syntax.split("\n"):
+        for start in range(0, len(line), 3):
+            for length in (1, 7, 30):
+                value = line[start : start + length]
+                yield value
+                yield value + "\x01"
+                yield value.swapcase()
+
+
+def _assert_contains(block: Block) -> None:
+    syntax = block.syntax()
+    for value in _values(syntax):
+        assert (value in block) == (value in syntax), value
+
+
+@pytest.mark.parametrize("example", EXAMPLES)
+def test_examples(example):
+    _assert_contains(example.get_example())
+
+
+def test_lazy_blocks():
+    file = File(header="Generated", fingerprint="1234")
+    file.add_specific_import("typing", "List")
+    file.add_specific_import("typing", "Dict")
+    class_ = Class("Client", inherit=("Base",))
+    class_.add_doc_line("A client.")
+    method = Method("get", arguments=("key:str",), return_value="List")
+    method.add_decorator("timer")
+    method.add_syntax_line("return [key]")
+    class_.insert(method, lazy=True)
+    file.insert(class_, lazy=True)
+    _assert_contains(file)
+    # The index is updated when the blocks change
+    method.add_syntax_line("print('unreachable')")
+    class_.add_specific_import("os", "path")
+    file.add_syntax_line("client = Client()")
+    _assert_contains(file)
+    assert "from typing import List" not in file
+    assert "print('unreachable')" in file
+
+
+def test_without_rendering(monkeypatch):
+    file = examples.file.get_example()
+    file.add_syntax_line("value = 1")
+    syntax = file.syntax()
+    file.add_syntax_line("other = 2")
+
+    def syntax_(*_, **__):
+        raise AssertionError("The block was rendered")
+
+    monkeypatch.setattr(Block, "syntax", syntax_)
+    assert "other = 2" in file
+    assert "value = 1" in file
+    assert "class " in file
+    assert "not in the file" not in file
+    monkeypatch.undo()
+    assert ("other = 2" in file) and ("other = 2" not in syntax)
+
+
+def test_fingerprint():
+    file = File(header="Generated", fingerprint=True)
+    file.add_syntax_line("value = 1")
+    _assert_contains(file)
+    assert "\0" not in file
+
+
+def test_multi_line_values():
+    function = Function("run")
+    function.add_syntax_line("return 1")
+    assert "def run():\n    return 1" in function
+    assert "    return 1" in function
+    assert "def run():\nreturn 1" not in function
+    assert "" in function
+
+
+def test_has_structure():
+    file = File(header=None)
+    function = Function("run")
+    class_ = Class("Client")
+    class_.insert(Method("get"), lazy=True)
+    file.insert(function)
+    file.insert(class_, lazy=True)
+    file.add_syntax_line("run()")
+    assert file.has_structure("run") and file.has_structure("Client")
+    with pytest.raises(KeyError):
+        # Only the syntax of a structure that isn't inserted lazily is kept
+        file.get_structure("run")
+    assert file.get_structure("Client") is class_
+    # Only the structures that were inserted into the block
+    assert not file.has_structure("get")
+    assert class_.has_structure("get")
+    with pytest.raises(KeyError):
+        file.get_structure("get")
+    other = Block().extend(file)
+    assert other.get_structure("Client") is class_
@@ -1,7 +1,9 @@
 # pylint: disable=missing-function-docstring
+import io
+import pickle
 from copy import deepcopy
 
-from codemate import Block
+from codemate import Block, Class, ClassMethod, File, Function, Method, StaticMethod
 from codemate.exceptions import InputError
 from tests import examples
 
@@ -105,6 +107,43 @@ def test_insert():
     assert INSERT_RESULT == block.syntax()
 
 
+def test_lazy_insert():
+    block = examples.block.get_example()
+    other = Block()
+    block.insert(other, lazy=True)
+    # Built after the insertion, top-down
+    other.add_import("math")
+    other.add_doc_line("Testing two blocks features")
+    other.add_syntax_lines("x = math.log2(8) ** 9", "LOGGER.debug(x)")
+    assert INSERT_RESULT == block.syntax()
+    assert INSERT_RESULT == deepcopy(block).syntax()
+    assert INSERT_RESULT == pickle.loads(pickle.dumps(block)).syntax()
+
+
+def test_lazy_insert_changes():
+    function = Function("outer")
+    inner = Function("inner")
+    function.insert(inner, lazy=True)
+    assert function.syntax() == "def outer():\n    def inner():\n"
+    inner.add_syntax_line("return 1")
+    assert function.syntax() == "def outer():\n    def inner():\n        return 1\n"
+    copy = deepcopy(function)
+    copy.get_structure("inner").add_syntax_line("return 2")
+    assert "return 2" in copy and "return 2" not in function
+
+
+def test_lazy_insert_cycle():
+    outer, inner = Block(), Block()
+    outer.insert(inner, lazy=True)
+    for block in (outer, inner):
+        try:
+            inner.insert(block, lazy=True)
+        except ValueError:
+            pass
+        else:
+            assert False, "Should raise ValueError"
+
+
 # noinspection PyBroadException
 def test_validate_exception():
     block = examples.block.get_example()
@@ -147,6 +186,17 @@ def test_repr():
     assert representation[0:6] == "Block(" and representation[-1] == ")"
 
 
+def test_slots():
+    for class_ in (Block, File, Function, Method, ClassMethod, StaticMethod, Class):
+        # The instances keep their attributes in slots
+        assert "__dict__" not in dir(class_)
+    block = examples.block.get_example()
+    block.set_import_sorter("native")
+    copy = pickle.loads(pickle.dumps(block))
+    assert copy.syntax() == block.syntax()
+    assert copy._import_sorter == "native"  # pylint: disable=protected-access
+
+
 def test_to_string():
     block = examples.block.get_example()
     assert TO_STRING_RESULT == str(block)
@@ -155,3 +205,22 @@ def test_to_string():
 def test_contains():
     block = examples.block.get_example()
     assert CONTAINS_VALUE_TEST in block
+
+
+def test_iter_syntax():
+    block = examples.block.get_example()
+    block.insert(examples.function.get_example())
+    block.insert(examples.class_.get_example())
+    chunks = list(block.iter_syntax(buffer_size=1))
+    assert len(chunks) > 1
+    assert block.syntax() == "".join(chunks)
+    assert block.syntax(indent=1) == "".join(block.iter_syntax(indent=1))
+    assert not list(Block().iter_syntax())
+
+
+def test_write_to():
+    block = examples.block.get_example()
+    block.insert(OTHER_BLOCK)
+    file = io.StringIO()
+    block.write_to(file)
+    assert INSERT_RESULT == file.getvalue()
@@ -0,0 +1,90 @@
+# pylint: disable=missing-function-docstring
+import pickle
+
+from codemate import Block, Class, File, Function, Method
+from tests import examples
+
+
+def _helper(name: str = "helper", value: int = 1) -> Function:
+    function = Function(name, arguments=("value: int",), return_value="int")
+    function.add_decorator("lru_cache()")
+    function.add_doc_line("A helper.")
+    function.add_import("os")
+    function.add_syntax_line(f"return value + {value}")
+    return function
+
+
+def test_equal_content():
+    assert _helper() == _helper() and hash(_helper()) == hash(_helper())
+    assert _helper().content_hash() == _helper().content_hash()
+    assert examples.file.get_example() == examples.file.get_example()
+    assert Block() == Block() and Block() != Block(indentation=2)
+    assert _helper() != _helper(value=2)
+    assert _helper() != _helper(name="other")
+    assert _helper() != _helper().add_import("sys")
+    assert _helper() != _helper().add_decorator("staticmethod")
+    assert _helper() != Function("helper")
+    assert Function("get", arguments=("self",)) != Method("get")
+    assert Class("A", inherit=("B",)) != Class("A", metaclass="B")
+    assert Block() != "" and Block() != object()
+
+
+def test_sections():
+    docs = Block().add_doc_line("x = 1")
+    lines = Block().add_syntax_line("x = 1")
+    assert docs != lines
+    inserted = Block().insert(Block().add_syntax_line("x = 1"), lazy=True)
+    assert inserted != lines
+
+
+def test_dedupe():
+    helpers = {}
+    for index in range(100):
+        class_ = Class(f"Client{index}")
+        class_.insert(_helper(), lazy=True)
+        helper = class_.get_structure("helper")
+        helpers.setdefault(helper, helper)
+    assert len(helpers) == 1
+
+
+def test_incremental():
+    class_ = Class("Client")
+    methods = [Method(f"get_{index}") for index in range(3)]
+    for method in methods:
+        method.add_syntax_line("return 1")
+        class_.insert(method, lazy=True)
+    digest = class_.content_hash()
+    reused = methods[0].content_hash()
+    methods[1].add_syntax_line("return 2")
+    # The changed method and the class are hashed again, the other methods are not
+    assert class_.content_hash() != digest
+    # pylint: disable=protected-access
+    assert methods[0]._cache.get(("hash",)) is reused
+    class_.remove_structure("get_1")
+    expected = Class("Client")
+    for index in (0, 2):
+        expected.insert(Method(f"get_{index}").add_syntax_line("return 1"), lazy=True)
+    assert class_ == expected
+
+
+def test_insert_by_value():
+    lazy = File(header=None).insert(_helper(), lazy=True)
+    # The content of a block inserted by value is its syntax
+    assert lazy != File(header=None).insert(_helper())
+    assert File(header=None).insert(_helper()) == File(header=None).insert(_helper())
+
+
+def test_pickle():
+    file = examples.file.get_example()
+    assert pickle.loads(pickle.dumps(file)) == file
+
+
+def test_equal_parents():
+    shared = Function("f").add_syntax_line("return 1")
+    first = Class("Client").insert(shared, lazy=True)
+    second = first.clone()
+    assert first == second and "return 1" in second.syntax()
+    first.remove_structure("f")
+    shared.add_syntax_line("changed = True")
+    # The removal from an equal parent doesn't detach the other parent
+    assert "changed = True" in second.syntax() and "changed = True" in second
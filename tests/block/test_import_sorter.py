@@ -0,0 +1,140 @@
+# pylint: disable=missing-function-docstring
+import random
+
+import isort
+import pytest
+
+from codemate import Block, Method
+from codemate.imports import sort_imports
+
+MODULES = (
+    "__future__",
+    "os",
+    "os.path",
+    "sys",
+    "typing",
+    "collections.abc",
+    "http2",
+    "http10",
+    "requests",
+    "Requests.adapters",
+    "yaml",
+    "attr",
+    "numpy.typing",
+    "django.db.models",
+)
+
+NAMES = (
+    "annotations",
+    "List",
+    "Dict",
+    "T",
+    "MAX_SIZE",
+    "URL",
+    "path",
+    "path2",
+    "path10",
+    "_private",
+    "Private2",
+    "get_long_name_of_a_function_that_is_generated",
+    "AVeryLongClassNameThatIsGeneratedByTheCodeGenerator",
+)
+
+
+def _isort(lines, indent: str) -> str:
+    syntax = "\n".join(indent + line for line in lines)
+    return isort.code(syntax)
+
+
+def _random_imports(rand: random.Random):
+    lines = []
+    for _ in range(rand.randint(1, 8)):
+        module = rand.choice(MODULES)
+        if rand.random() < 0.4:
+            lines.append(f"import {module}")
+        else:
+            names = rand.sample(NAMES, rand.randint(1, 6))
+            lines.append(f"from {module} import {', '.join(names)}")
+    return lines
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_conformance(seed):
+    rand = random.Random(seed)
+    lines = _random_imports(rand)
+    indent = rand.choice(("", "    ", "        " * 4))
+    syntax = sort_imports(lines, indent)
+    if syntax is not None:
+        assert syntax == _isort(lines, indent)
+
+
+def test_conformance_coverage():
+    # The random imports should rarely require isort
+    sorted_count = sum(
+        sort_imports(_random_imports(random.Random(seed))) is not None
+        for seed in range(200)
+    )
+    assert sorted_count > 150
+
+
+def test_merge():
+    lines = (
+        "from typing import List, Dict",
+        "from typing import Dict, Any",
+        "import sys",
+        "import sys",
+        "import requests",
+        "from __future__ import annotations",
+    )
+    assert sort_imports(lines) == (
+        "from __future__ import annotations\n"
+        "\n"
+        "import sys\n"
+        "from typing import Any, Dict, List\n"
+        "\n"
+        "import requests\n"
+    )
+    assert sort_imports(lines, "  ") == _isort(lines, "  ")
+
+
+@pytest.mark.parametrize(
+    "line",
+    (
+        "import os, sys",
+        "import numpy as np",
+        "from . import utils",
+        "from .utils import get",
+        "from typing import List as L",
+        "from typing import *",
+        "from os import (path)",
+        f"from typing import {'get_' * 20}",
+    ),
+)
+def test_unsupported(line):
+    assert sort_imports([line]) is None
+
+
+def test_block_sorter():
+    block = Block()
+    block.add_imports("requests", "os", "sys")
+    block.add_specific_import("typing", *NAMES[1:])
+    block.add_specific_import("os", "path")
+    block.add_import("numpy as np")
+    expected = block.syntax()
+    assert block.set_import_sorter("native").syntax() == expected
+    method = Method("get")
+    method.add_specific_import("typing", "List")
+    method.set_import_sorter("native")
+    assert method.syntax(indent=1) == (
+        "    def get(self):\n        from typing import List\n"
+    )
+    with pytest.raises(ValueError):
+        block.set_import_sorter("unknown")
+
+
+def test_global_sorter(monkeypatch):
+    monkeypatch.setattr(Block, "import_sorter", "native")
+    method = Method("get")
+    method.add_specific_import("typing", "List")
+    assert method.import_sorter == "native"
+    assert method.syntax() == "def get(self):\n    from typing import List\n"
@@ -0,0 +1,137 @@
+# pylint: disable=missing-function-docstring,protected-access
+import itertools
+import random
+import re
+from functools import partial
+from typing import Set
+
+import isort
+import pytest
+
+from codemate import Block, Class, Function, Method, StaticMethod
+from codemate.structure import Structure
+from tests import examples
+
+LINES = (
+    "x = 1",
+    "",
+    "    ",
+    "if x:\n    y = 2\n\nz = 3",
+    "\nprint(x)\n",
+    "return x",
+)
+
+IMPORTS = ("math", "sys", "os.path")
+
+
+def _legacy_parse_block(block: Block, text: str, new_line: int = 0, indent: int = 0):
+    prefix = block._indentation * indent
+    return "\n" * new_line + re.sub("(^|\n)(.)", f"\\1{prefix}\\2", text)
+
+
+def _legacy_syntax(block: Block, indent: int = 0, imports: bool = True) -> str:
+    """
+    The syntax generation before the single pass renderer, used as the reference.
+    """
+    if isinstance(block, Structure):
+        syntax = ""
+        if block._decorators:
+            format_decorator = partial(
+                _legacy_parse_block, block, new_line=1, indent=indent
+            )
+            syntax += "".join(format_decorator(line) for line in block._decorators)
+            syntax = syntax.strip() + "\n"
+        syntax += block._format_signature(indent)
+        content = _legacy_block_syntax(block, indent + 1, imports)
+        return syntax + "\n" + _legacy_parse_block(block, content)
+    return _legacy_block_syntax(block, indent, imports)
+
+
+def _legacy_block_syntax(block: Block, indent: int, imports: bool) -> str:
+    format_line = partial(_legacy_parse_block, block, new_line=1, indent=indent)
+    syntax = ""
+    if block._docs:
+        syntax += _legacy_parse_block(block, '"""', indent=indent)
+        syntax += "".join(format_line(doc) for doc in block._docs)
+        syntax += format_line('"""') + "\n"
+    if imports and _legacy_imports(block):
+        if syntax:
+            syntax += "\n"
+        imports_syntax = "".join(map(format_line, _legacy_imports(block)))
+        syntax += isort.code(imports_syntax.strip("\n"))
+    if block._lines:
+        if syntax:
+            syntax += "\n"
+        lines = (
+            line if isinstance(line, str) else _legacy_syntax(line, imports=False)
+            for line in block._iter_lines()
+        )
+        syntax += "".join(map(format_line, lines)).strip("\n")
+    if syntax and syntax[-1] != "\n":
+        return syntax + "\n"
+    return syntax
+
+
+def _legacy_imports(block: Block) -> Set[str]:
+    imports = set(block._imports)
+    for line in block._iter_lines():
+        if isinstance(line, Block):
+            imports.update(_legacy_imports(line))
+    return imports
+
+
+_KEYS = itertools.count()
+
+
+def _random_block(rand: random.Random, depth: int) -> Block:
+    kind = rand.choice(("block", "function", "class", "static"))
+    # The structures of a block have unique names
+    key = next(_KEYS)
+    if kind == "function":
+        block: Block = Function(f"f{depth}_{key}", arguments=("a", "b:int"))
+    elif kind == "class":
+        block = Class(f"C{depth}_{key}", inherit=("Base",), metaclass="Meta")
+    elif kind == "static":
+        block = StaticMethod(f"s{depth}_{key}")
+    else:
+        block = Block(indentation=rand.choice((2, 4)))
+    if isinstance(block, Structure) and rand.random() < 0.5:
+        block.add_decorator(rand.choice(("timer", "cache  ", "wraps(f)")))
+    if rand.random() < 0.3:
+        block.add_doc_lines("A generated block.", "", indent=rand.randint(0, 1))
+    if rand.random() < 0.4:
+        block.add_imports(*rand.sample(IMPORTS, 2))
+    for _ in range(rand.randint(0, 4)):
+        if depth and rand.random() < 0.4:
+            block.insert(_random_block(rand, depth - 1), lazy=rand.random() < 0.5)
+        else:
+            block.add_syntax_line(rand.choice(LINES), indent=rand.randint(0, 2))
+    return block
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_trees(seed):
+    rand = random.Random(seed)
+    block = _random_block(rand, depth=4)
+    for indent in range(3):
+        for imports in (True, False):
+            expected = _legacy_syntax(block, indent, imports)
+            assert expected == block.syntax(indent, imports)
+
+
+def test_examples():
+    for module in (examples.block, examples.function, examples.method):
+        block = module.get_example()
+        assert _legacy_syntax(block) == block.syntax()
+    method = Method("get", arguments=("item_id:str",), return_value="str")
+    method.add_decorator("timer")
+    method.add_syntax_line("pass")
+    assert _legacy_syntax(method, indent=2) == method.syntax(indent=2)
+
+
+def test_empty_block():
+    assert Block().syntax() == ""
+    block = Block()
+    block.add_syntax_lines("", "")
+    assert block.syntax() == ""
+    assert Function("empty").syntax() == "def empty():\n"
@@ -0,0 +1,175 @@
+# pylint: disable=missing-function-docstring
+import pickle
+
+import pytest
+
+from codemate import Block, Class, File, Function, Method
+
+
+def _function(name: str, value: int) -> Function:
+    function = Function(name)
+    function.add_syntax_line(f"return {value}")
+    return function
+
+
+def _file(first: int = 1, second: int = 2) -> File:
+    file = File(header=None)
+    file.add_syntax_line("START = 0")
+    if first:
+        file.insert(_function("first", first), lazy=True)
+    if second:
+        file.insert(_function("second", second))
+    file.add_syntax_line("END = 3")
+    return file
+
+
+def test_duplicates():
+    file = _file()
+    for lazy in (True, False):
+        with pytest.raises(ValueError):
+            file.insert(_function("first", 4), lazy=lazy, unique=True)
+        with pytest.raises(ValueError):
+            file.insert(Class("second"), lazy=lazy, unique=True)
+    # The failed insertions didn't change the file
+    assert file.syntax() == _file().syntax()
+    other = Block().insert(_function("second", 5), lazy=True)
+    with pytest.raises(ValueError):
+        file.extend(other, unique=True)
+    assert "return 5" not in file
+    # Structures with the same name in different blocks
+    class_ = Class("Client")
+    class_.insert(Method("first"), lazy=True)
+    file.insert(class_, lazy=True)
+    assert file.has_structure("Client") and class_.has_structure("first")
+
+
+def test_replace():
+    file = _file()
+    file.syntax()
+    file.replace_structure(_function("first", 10), lazy=True)
+    file.replace_structure(_function("second", 20))
+    assert file.syntax() == _file(10, 20).syntax()
+    assert "return 1\n" not in file and "return 10" in file
+    assert file.validate()
+    with pytest.raises(KeyError):
+        file.replace_structure(_function("third", 3))
+    with pytest.raises(ValueError):
+        file.replace_structure(Block())
+
+
+def test_replaced_structure_is_detached():
+    file = _file()
+    previous = file.get_structure("first")
+    file.replace_structure(_function("first", 10), lazy=True)
+    file.syntax()
+    previous.add_syntax_line("x = 1")
+    # The changes of the replaced structure don't clear the syntax of the file
+    assert (0, True) in file._cache  # pylint: disable=protected-access
+    assert "x = 1" not in file
+
+
+def test_remove():
+    file = _file()
+    assert "def first" in file
+    file.remove_structure("first").remove_structure("second")
+    assert file.syntax() == _file(0, 0).syntax()
+    assert "def first" not in file and not file.has_structure("first")
+    with pytest.raises(KeyError):
+        file.remove_structure("first")
+    # The name may be used again, the structure is added at the end
+    file.insert(_function("first", 1), lazy=True)
+    expected = _file(0, 0).insert(_function("first", 1), lazy=True)
+    assert file.syntax() == expected.syntax()
+
+
+def test_nested_changes():
+    file = File(header=None)
+    class_ = Class("Client")
+    class_.insert(Method("get").add_syntax_line("return 1"), lazy=True)
+    file.insert(class_, lazy=True)
+    assert "def get(self)" in file
+    class_.remove_structure("get")
+    assert "def get(self)" not in file
+    class_.insert(Method("post").add_syntax_line("return 2"), lazy=True)
+    assert "def post(self)" in file
+    assert file.syntax() == "class Client:\n    def post(self):\n        return 2\n"
+
+
+def test_pickle():
+    file = pickle.loads(pickle.dumps(_file()))
+    assert file.syntax() == _file().syntax()
+    file.add_syntax_line("LAST = 4")
+    file.remove_structure("first")
+    assert file.syntax() == _file(first=0).add_syntax_line("LAST = 4").syntax()
+
+
+def test_positions():
+    file = _file()
+    file.insert(_function("third", 3), lazy=True)
+    file.remove_structure("second")
+    file.replace_structure(_function("third", 30), lazy=True)
+    file.remove_structure("first")
+    expected = _file(0, 0).insert(_function("third", 30), lazy=True)
+    assert file.syntax() == expected.syntax()
+    file.remove_structure("third")
+    assert file.syntax() == _file(0, 0).syntax()
+    block = Block().insert(_function("only", 1), lazy=True)
+    block.remove_structure("only")
+    assert block.syntax() == "" and not block._lines  # pylint: disable=W0212
+
+
+def test_eager_insert_keeps_nested_imports():
+    class_ = Class("Client")
+    class_.insert(
+        Method("cwd").add_import("os").add_syntax_line("return os.getcwd()"), lazy=True
+    )
+    file = File(header=None).insert(class_)
+    assert "import os" in file.syntax() and "import os" in file
+    # Replacing by value copies the nested imports as well
+    other = Class("Client")
+    other.insert(
+        Method("now").add_import("time").add_syntax_line("return time.time()"),
+        lazy=True,
+    )
+    file.replace_structure(other)
+    assert "import time" in file.syntax() and "import time" in file
+    assert file.validate()
+
+
+def test_redefinitions():
+    class_ = Class("Point")
+    getter = Method("x", return_value="int").add_decorator("property")
+    class_.insert(getter.add_syntax_line("return self._x"), lazy=True)
+    setter = Method("x", arguments=("value: int",)).add_decorator("x.setter")
+    class_.insert(setter.add_syntax_line("self._x = value"), lazy=True)
+    assert class_.syntax() == (
+        "class Point:\n"
+        "    @property\n"
+        "    def x(self) -> int:\n"
+        "        return self._x\n"
+        "\n"
+        "    @x.setter\n"
+        "    def x(self, value: int):\n"
+        "        self._x = value\n"
+    )
+    assert class_.validate()
+    # The name refers to the last definition, as in Python
+    assert class_.get_structure("x") is setter
+    deleter = Method("x").add_decorator("x.deleter").add_syntax_line("del self._x")
+    class_.insert(deleter)
+    class_.remove_structure("x")
+    assert class_.get_structure("x") is setter and "del self._x" not in class_
+    class_.remove_structure("x")
+    assert class_.get_structure("x") is getter and "self._x = value" not in class_
+    class_.remove_structure("x")
+    assert not class_.has_structure("x")
+
+
+def test_extend_redefinitions():
+    first = Block().insert(_function("load", 1), lazy=True)
+    first.insert(_function("load", 2), lazy=True)
+    file = _file(first=0, second=0).extend(first)
+    assert file.get_structure("load").syntax() == "def load():\n    return 2\n"
+    file.remove_structure("load")
+    assert file.get_structure("load").syntax() == "def load():\n    return 1\n"
+    assert pickle.loads(pickle.dumps(file)).syntax() == file.syntax()
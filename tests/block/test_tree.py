@@ -0,0 +1,192 @@
+# pylint: disable=missing-function-docstring
+import ast
+import sys
+
+import pytest
+
+from codemate import Block, Class, File, Function, Method, validator
+from codemate.exceptions import InputError
+from tests import examples
+
+
+def _assert_tree(block: Block) -> None:
+    expected = ast.parse(block.syntax())
+    # The line numbers are the ones in the syntax
+    assert ast.dump(block.tree(), include_attributes=True) == ast.dump(
+        expected, include_attributes=True
+    )
+
+
+def _lazy_file() -> File:
+    file = File(header="Generated")
+    file.add_import("os")
+    file.add_variable("LIMIT", type="int", value="10")
+    class_ = Class("Client", inherit=("Base",))
+    class_.add_doc_line("A client.")
+    class_.add_specific_import("typing", "List")
+    for index in range(3):
+        method = Method(f"get_{index}", arguments=("key:str",), return_value="List")
+        method.add_decorator("timer")
+        method.add_syntax_block(
+            """
+            if key:
+                return [\"\"\"
+            multi-line
+            \"\"\"]
+            return []
+            """
+        )
+        class_.insert(method, lazy=True)
+    file.insert(class_, lazy=True)
+    file.add_syntax_line("client = Client()")
+    return file
+
+
+@pytest.mark.parametrize(
+    "example",
+    (
+        examples.block,
+        examples.function,
+        examples.class_,
+        examples.method,
+        examples.file,
+    ),
+)
+def test_examples(example):
+    _assert_tree(example.get_example())
+
+
+def test_lazy_blocks():
+    file = _lazy_file()
+    _assert_tree(file)
+    function = Function("inner", is_async=True)
+    function.add_syntax_line("await other()")
+    file.insert(function, lazy=True)
+    _assert_tree(file)
+    assert file.validate()
+
+
+def test_incremental(monkeypatch):
+    file = _lazy_file()
+    assert file.validate()
+    parts = []
+    parse_part = validator.parse_part
+
+    def counting_parse_part(lines, prefix=""):
+        parts.append(tuple(lines))
+        return parse_part(lines, prefix)
+
+    monkeypatch.setattr(validator, "parse_part", counting_parse_part)
+    assert file.validate()
+    assert not parts
+    method = Method("get_new")
+    method.add_syntax_line("return 1")
+    class_ = Class("Other")
+    class_.insert(method, lazy=True)
+    file.insert(class_, lazy=True)
+    assert file.validate()
+    # The parts of the file and of the new blocks, the client class is kept
+    assert len(parts) == 7
+    _assert_tree(file)
+
+
+def test_parsed_as_whole():
+    block = Block()
+    block.add_syntax_line("if True:")
+    inner = Block()
+    inner.add_syntax_line("x = 1", indent=1)
+    block.insert(inner, lazy=True)
+    _assert_tree(block)
+    decorated = Block()
+    decorated.add_syntax_line("@timer")
+    function = Function("run")
+    function.add_syntax_line("pass")
+    decorated.insert(function, lazy=True)
+    _assert_tree(decorated)
+    fingerprinted = File(fingerprint=True)
+    fingerprinted.add_syntax_line("x = 1")
+    _assert_tree(fingerprinted)
+
+
+def test_line_continuation():
+    # The renderer drops the empty line after the continuation, so it continues nothing
+    class_ = Class("Client").add_syntax_lines("x = 1 \\", "")
+    assert not class_.validate(raise_error=False)
+    function = Function("run").add_syntax_lines("x = 1 \\", "")
+    assert not Class("Client").insert(function, lazy=True).validate(raise_error=False)
+    block = Block().add_syntax_lines("x = 1 \\", "")
+    block.insert(Block().add_syntax_line("+ 2"), lazy=True)
+    _assert_tree(block)
+    assert block.validate()
+
+
+def test_invalid():
+    file = _lazy_file()
+    function = Function("empty")
+    file.insert(function, lazy=True)
+    assert not file.validate(raise_error=False)
+    with pytest.raises(InputError):
+        file.tree()
+    function.add_syntax_line("x = (")
+    with pytest.raises(InputError):
+        file.validate()
+
+
+def test_compile():
+    file = _lazy_file()
+    file.add_syntax_line("RESULT = [LIMIT * 2, os.sep]")
+    namespace = {"Base": object, "timer": lambda function: function}
+    code = compile(file.tree(), "<generated>", "exec")
+    exec(code, namespace)  # pylint: disable=exec-used
+    assert namespace["RESULT"] == [20, "/"]
+    expected = {"Base": object, "timer": namespace["timer"]}
+    exec(file.syntax(), expected)  # pylint: disable=exec-used
+    assert namespace["client"].get_0("key") == expected["client"].get_0("key")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason="ast.unparse is new in 3.9")
+def test_unparse():
+    file = _lazy_file()
+    assert ast.dump(ast.parse(ast.unparse(file.tree()))) == ast.dump(file.tree())
+
+
+def test_parts_cache(monkeypatch):
+    validator.PARTS_CACHE.clear()
+    parses = []
+    parse = ast.parse
+
+    def counting_parse(source, *args, **kwargs):
+        parses.append(source)
+        return parse(source, *args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+    file = File(header=None)
+    functions = [Function("run") for _ in range(10)]
+    for function in functions:
+        function.add_syntax_line("return 1")
+        # A block may have a single structure with a name, each one has its own block
+        file.insert(Block().insert(function, lazy=True), lazy=True)
+    assert file.validate()
+    # The signature and the body of the identical functions are parsed once
+    assert len(parses) == 2
+    functions[3].add_syntax_line("x = 2")
+    assert file.validate()
+    assert len(parses) == 3
+    _assert_tree(file)
+
+
+def test_error_line_numbers():
+    file = _lazy_file()
+    function = Function("broken")
+    function.add_syntax_lines("x = 1", "y = [", "z = 3")
+    class_ = Class("Outer")
+    class_.insert(function, lazy=True)
+    file.insert(class_, lazy=True)
+    with pytest.raises(InputError) as error:
+        file.validate()
+    # The line numbers are the ones in the file, as when the file is parsed
+    with pytest.raises(SyntaxError) as syntax_error:
+        ast.parse(file.syntax())
+    assert f"line-{syntax_error.value.lineno} " in str(error.value)
+    line = file.syntax().split("\n").index("        y = [") + 1
+    assert f"{line} |        y = [" in str(error.value)
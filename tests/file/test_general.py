@@ -1,6 +1,10 @@
 # pylint: disable=missing-function-docstring
 import os
+import stat
 import tempfile
+from unittest import mock
+
+import pytest
 
 from codemate import File
 from tests import examples
@@ -16,6 +20,96 @@ def test_save_file():
         file.save(path, use_black=False)
 
 
+def test_save_file_without_black():
+    with tempfile.TemporaryDirectory() as tmp_dirname:
+        file = examples.file.get_example()
+        path = os.path.join(tmp_dirname, "tmp.py")
+        file.save(path, use_black=False)
+        with open(path, encoding="utf-8") as saved:
+            assert file.syntax() == saved.read()
+
+
 def test_complex_file():
     file = examples.file.get_example()
     assert examples.file.get_syntax() == file.use_black()
+
+
+def test_save_file_incremental():
+    with tempfile.TemporaryDirectory() as tmp_dirname:
+        file = examples.file.get_example()
+        path = os.path.join(tmp_dirname, "tmp.py")
+        assert file.save(path, incremental=True)
+        mtime = os.stat(path).st_mtime_ns
+        assert not file.save(path, incremental=True)
+        assert os.stat(path).st_mtime_ns == mtime
+        assert file.save(path, use_black=False, incremental=True)
+        # The file is replaced by a complete file, no temporary file is left
+        assert os.listdir(tmp_dirname) == ["tmp.py"]
+
+
+def test_default_header():
+    # The header is generated when the file is created, not when the module is imported
+    with mock.patch("codemate.file.datetime") as datetime:
+        datetime.now.return_value.isoformat.return_value = "now"
+        assert "\nGenerated at: now\n" in File().syntax()
+    assert File(header=None).syntax() == ""
+
+
+def test_fingerprint_header():
+    file = File(fingerprint="inputs-hash", version="1.2.0")
+    assert "Generated at" not in file.syntax()
+    assert "\nFingerprint: inputs-hash\nVersion: 1.2.0\n" in file.syntax()
+    assert file.fingerprint == "inputs-hash"
+    custom = File(header="Custom", fingerprint="inputs-hash")
+    assert custom.syntax() == '"""\nCustom\nFingerprint: inputs-hash\n"""\n'
+    assert File().fingerprint is None
+    with pytest.raises(ValueError):
+        File(header=None, version="1.2.0")
+
+
+def test_body_fingerprint():
+    first = examples.file.get_example()
+    file = File(fingerprint=True)
+    file.extend(first)
+    same = File(fingerprint=True)
+    same.extend(first)
+    assert file.syntax() == same.syntax() == "".join(file.iter_syntax())
+    fingerprint = file.fingerprint
+    assert fingerprint and len(fingerprint) == 64
+    assert f"Fingerprint: {fingerprint}\n" in file.syntax()
+    file.add_syntax_line("x = 1")
+    assert file.fingerprint != fingerprint
+
+
+@pytest.mark.parametrize("use_black", (True, False))
+def test_is_up_to_date(tmp_path, use_black):
+    path = str(tmp_path / "generated.py")
+    file = File(fingerprint=True, version="1")
+    file.add_syntax_line("x  =  1")
+    assert not file.is_up_to_date(path)
+    file.save(path, use_black=use_black)
+    assert file.is_up_to_date(path)
+    assert not file.save(path, use_black=use_black, incremental=True)
+    file.add_syntax_line("y = 2")
+    assert not file.is_up_to_date(path)
+    assert file.save(path, use_black=use_black, incremental=True)
+    other = File(fingerprint=file.fingerprint or "", version="2")
+    assert not other.is_up_to_date(path)
+    assert not File().is_up_to_date(path)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="The modes and links are POSIX features")
+def test_save_keeps_mode_and_link(tmp_path):
+    target = str(tmp_path / "target.py")
+    link = str(tmp_path / "link.py")
+    file = examples.file.get_example()
+    file.save(target, use_black=False)
+    os.chmod(target, 0o755)
+    os.symlink(target, link)
+    file.add_syntax_line("x = 1")
+    file.save(link, use_black=False)
+    assert os.path.islink(link) and os.readlink(link) == target
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o755
+    with open(target, encoding="utf-8") as saved:
+        assert saved.read() == file.syntax()
+    assert sorted(os.listdir(str(tmp_path))) == ["link.py", "target.py"]
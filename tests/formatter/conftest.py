@@ -0,0 +1,24 @@
+# pylint: disable=missing-function-docstring
+import black
+import pytest
+
+from codemate import formatter
+
+
+@pytest.fixture(name="black_calls")
+def fixture_black_calls(monkeypatch):
+    calls = []
+    format_str = black.format_str
+
+    def counted_format_str(*args, **kwargs):
+        calls.append(args)
+        return format_str(*args, **kwargs)
+
+    monkeypatch.setattr(black, "format_str", counted_format_str)
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def fixture_disable_cache():
+    yield
+    formatter.disable_cache()
@@ -0,0 +1,61 @@
+# pylint: disable=missing-function-docstring
+import os
+
+import black
+
+from codemate import formatter
+from tests import examples
+
+
+def _build(directory: str) -> str:
+    file = examples.file.get_example()
+    path = os.path.join(directory, "generated.py")
+    file.save(path)
+    with open(path, encoding="utf-8") as saved:
+        return saved.read()
+
+
+def test_disabled(black_calls):
+    block = examples.block.get_example()
+    block.use_black()
+    block.use_black()
+    assert len(black_calls) == 2
+    assert formatter.cache_info() is None
+
+
+def test_identical_build(black_calls, tmp_path):
+    formatter.enable_cache(directory=str(tmp_path / "cache"))
+    first = _build(str(tmp_path))
+    # The module code, the timer function and the APIWrapper class
+    assert len(black_calls) == 3
+    assert first == _build(str(tmp_path))
+    assert len(black_calls) == 3
+    assert formatter.cache_info() == (3, 0, 3, 3)
+    # A new process starts with an empty memory tier
+    formatter.enable_cache(directory=str(tmp_path / "cache"))
+    assert first == _build(str(tmp_path))
+    assert len(black_calls) == 3
+    assert formatter.cache_info() == (3, 3, 0, 3)
+    assert first == examples.file.get_syntax()
+
+
+def test_memory_only(black_calls, tmp_path):
+    formatter.enable_cache(maxsize=1, use_disk=False)
+    block = examples.block.get_example()
+    function = examples.function.get_example()
+    for _ in range(2):
+        block.use_black()
+    function.use_black()
+    block.use_black()
+    assert len(black_calls) == 3
+    assert formatter.cache_info() == (1, 0, 3, 1)
+    assert not list(tmp_path.iterdir())
+
+
+def test_mode(black_calls):
+    cache = formatter.enable_cache(use_disk=False)
+    source = "x = 'a'\n"
+    assert cache.format_str(source, black.Mode()) == 'x = "a"\n'
+    mode = black.Mode(string_normalization=False)
+    assert cache.format_str(source, mode) == source
+    assert len(black_calls) == 2
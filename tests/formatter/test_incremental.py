@@ -0,0 +1,114 @@
+# pylint: disable=missing-function-docstring
+import random
+
+import black
+import pytest
+
+from codemate import Class, File, Function, Method, formatter
+from codemate.structure import Structure
+from tests import examples
+
+RUNS = (
+    "x=1",
+    "print( 'a' )",
+    "# A comment",
+    "if x:\n    y = [1,\n    2]",
+    "import os",
+    "async def task():\n    await  other()",
+    "name = f'{x}'",
+    "values = {'key':   1}\n\n\n\n",
+    "call_a_function_with_a_long_name(first_argument, second_argument, *arguments)",
+)
+
+
+def _random_file(rand: random.Random) -> File:
+    file = File(header="Generated")
+    for index in range(rand.randint(1, 12)):
+        kind = rand.random()
+        if kind < 0.4:
+            structure: Structure = Function(
+                f"function_{index}",
+                arguments=("first_argument", "second_argument", "*arguments"),
+            )
+        elif kind < 0.7:
+            structure = Class(f"Class{index}")
+            method = Method("get", arguments=("key:str",))
+            method.add_syntax_line(rand.choice(RUNS))
+            structure.insert(method)
+        else:
+            file.add_syntax_lines(*rand.sample(RUNS, rand.randint(1, 3)))
+            continue
+        if rand.random() < 0.3:
+            structure.add_decorator("timer")
+        structure.add_syntax_lines(*rand.sample(RUNS, rand.randint(1, 3)))
+        if rand.random() < 0.2:
+            file.add_syntax_line(rand.choice(("# Attached", "", "# Spaced\n")))
+        file.insert(structure)
+    return file
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_random_files(seed):
+    formatter.enable_cache(use_disk=False)
+    file = _random_file(random.Random(seed))
+    if file.validate(raise_error=False):
+        expected = black.format_str(file.syntax(), mode=black.Mode())
+        assert expected == file.use_black()
+
+
+def test_examples():
+    formatter.enable_cache(use_disk=False)
+    assert examples.file.get_syntax() == examples.file.get_example().use_black()
+
+
+def test_target_versions():
+    # The f-string in the first fragment makes Black add trailing commas in the others
+    formatter.enable_cache(use_disk=False)
+    arguments = ", ".join(f"argument_{index}" for index in range(10))
+    source = (
+        "name = f'{x}'\n"
+        f"def function({arguments}, *arguments):\n"
+        "    pass\n"
+        f"call_function({arguments}, *arguments)\n"
+    )
+    expected = black.format_str(source, mode=black.Mode())
+    assert expected.count("*arguments,\n") == 2
+    assert formatter.format_module(source) == expected
+    assert len(formatter.split_module(source) or ()) == 3
+
+
+def test_split_module():
+    source = (
+        "import os\n"
+        "\n"
+        "# Attached\n"
+        "def first():\n"
+        "    pass\n"
+        "@timer\n"
+        "def second():\n"
+        "    pass\n"
+        "x = 1\n"
+        "y = 2\n"
+    )
+    assert formatter.split_module(source) == [
+        "import os\n\n# Attached\ndef first():\n    pass",
+        "@timer\ndef second():\n    pass",
+        "x = 1\ny = 2\n",
+    ]
+    assert formatter.split_module("# fmt: off\nx = 1\n") is None
+    assert formatter.split_module("x = (\n") is None
+
+
+def test_incremental(black_calls):
+    formatter.enable_cache(use_disk=False)
+    file = File(header="Generated")
+    functions = [Function(f"function_{index}") for index in range(50)]
+    for function in functions:
+        function.add_syntax_line("return  1")
+        file.insert(function, lazy=True)
+    syntax = file.use_black()
+    assert len(black_calls) == 51
+    functions[20].add_syntax_line("x = [1,2]")
+    assert file.use_black() != syntax
+    assert len(black_calls) == 52
+    assert black.format_str(file.syntax(), mode=black.Mode()) == file.use_black()
@@ -0,0 +1,36 @@
+# pylint: disable=missing-function-docstring
+import os
+import random
+
+import black
+
+from codemate import formatter
+from tests import examples
+from tests.formatter.test_incremental import _random_file
+
+
+def test_examples():
+    file = examples.file.get_example()
+    assert examples.file.get_syntax() == file.use_black(jobs=2)
+
+
+def test_random_files():
+    files = (_random_file(random.Random(seed)) for seed in range(20))
+    source = "\n".join(file.syntax() for file in files if file.validate(False))
+    expected = black.format_str(source, mode=black.Mode())
+    assert formatter.format_module(source, jobs=3) == expected
+
+
+def test_cache(black_calls, tmp_path):
+    cache = formatter.enable_cache(use_disk=False)
+    file = examples.file.get_example()
+    syntax = file.use_black(jobs=2)
+    # The fragments were formatted by the processes
+    assert not black_calls
+    assert cache.info().misses == 3
+    assert file.use_black(jobs=2) == syntax
+    assert cache.info().hits == 3
+    path = os.path.join(str(tmp_path), "generated.py")
+    file.save(path, jobs=2)
+    with open(path, encoding="utf-8") as saved:
+        assert saved.read() == syntax
@@ -0,0 +1,96 @@
+# pylint: disable=missing-function-docstring,protected-access
+import pickle
+
+import pytest
+
+from codemate import Class, ClassMethod, File, Function, Method
+
+
+def _prototype() -> Method:
+    method = Method("get", arguments=("item_id: str",), return_value="dict")
+    method.add_decorator("timer")
+    method.add_doc_line("Sends the request.")
+    method.add_import("json")
+    method.add_syntax_line("response = self._session.get(self._url)")
+    method.add_syntax_line("return json.loads(response.text)")
+    return method
+
+
+def test_overrides():
+    clone = _prototype().clone(name="get_user", return_value="User")
+    expected = Method("get_user", arguments=("item_id: str",), return_value="User")
+    expected.add_decorator("timer").add_doc_line("Sends the request.")
+    expected.add_import("json")
+    expected.add_syntax_line("response = self._session.get(self._url)")
+    expected.add_syntax_line("return json.loads(response.text)")
+    assert isinstance(clone, Method) and clone == expected
+    assert clone.syntax() == expected.syntax()
+    clone = _prototype().clone(arguments=("user_id: int",), is_async=True)
+    assert "async def get(self, user_id: int) -> dict:" in clone.syntax()
+    clone = ClassMethod("create", arguments=("value",)).clone(arguments=())
+    assert clone.syntax() == "@classmethod\ndef create(cls):\n"
+    clone = Class("Client", inherit=("Base",)).clone(metaclass="ABCMeta", inherit=())
+    assert clone.syntax() == "class Client(metaclass=ABCMeta):\n"
+    with pytest.raises(TypeError):
+        _prototype().clone(body="pass")
+    with pytest.raises(TypeError):
+        Function("get").clone(metaclass="ABCMeta")
+
+
+def test_shared_content():
+    prototype = _prototype()
+    clones = [prototype.clone(name=f"get_{index}") for index in range(3)]
+    for clone in clones:
+        assert clone._lines is clones[0]._lines is prototype._lines
+        assert clone._docs is prototype._docs
+        assert clone._imports is prototype._imports
+        assert clone._decorators is prototype._decorators
+
+
+def test_copy_on_write():
+    prototype = _prototype()
+    expected = _prototype().syntax()
+    clone = prototype.clone()
+    clone.add_syntax_line("print(response)").add_doc_line("More docs.")
+    clone.add_import("os").add_decorator("retry")
+    assert prototype.syntax() == expected
+    assert "print(response)" in clone and "print(response)" not in prototype
+    prototype.add_syntax_line("assert response")
+    assert "assert response" not in clone
+    assert clone.clone() == clone
+
+
+def test_shared_structures():
+    class_ = Class("Client")
+    class_.insert(Method("get").add_syntax_line("return 1"), lazy=True)
+    class_.insert(Method("post").add_syntax_line("return 2"), lazy=True)
+    clone = class_.clone(name="OtherClient")
+    clone.remove_structure("post")
+    assert class_.has_structure("post") and not clone.has_structure("post")
+    assert "def post(self)" in class_.syntax()
+    # The lazily inserted structures are shared, as if they were inserted into both
+    class_.get_structure("get").add_syntax_line("x = 1")
+    assert "x = 1" in clone.syntax()
+    file = File(header=None).insert(class_, lazy=True).insert(clone, lazy=True)
+    assert file.validate()
+
+
+def test_pickle():
+    prototype = _prototype()
+    clone = prototype.clone(name="get_user")
+    assert pickle.loads(pickle.dumps(clone)) == clone
+
+
+def test_many_clones_share_a_structure():
+    prototype = Class("Client")
+    method = Method("get").add_syntax_line("return 1")
+    prototype.insert(method, lazy=True)
+    clones = [prototype.clone(name=f"Client{index}") for index in range(1_000)]
+    assert len(method._parents) == len(clones) + 1
+    clones[0].remove_structure("get")
+    method.add_syntax_line("x = 1")
+    assert "x = 1" in clones[1].syntax() and "x = 1" not in clones[0].syntax()
+    del clones
+    # The collected clones are dropped when the method changes
+    method.add_syntax_line("y = 2")
+    assert len(method._parents) == 1
@@ -0,0 +1,67 @@
+# pylint: disable=missing-function-docstring
+import pytest
+
+from codemate import Class, File, Method, interning
+from tests import examples
+
+
+@pytest.fixture(autouse=True)
+def fixture_disable_interning():
+    yield
+    interning.disable_interning()
+
+
+def _method(name: str) -> Method:
+    method = Method(name, arguments=("timeout: float",), return_value="dict")
+    method.add_decorator("timer")
+    method.add_doc_line("Sends the request.")
+    method.add_syntax_line("response = self._session.get(self._url)")
+    method.add_syntax_line("return response.json()")
+    return method
+
+
+def test_disabled():
+    first, second = _method("first"), _method("second")
+    # pylint: disable=protected-access
+    assert first._decorators[0] is not second._decorators[0]
+    assert interning.interning_info() is None
+
+
+def test_shared_strings():
+    interning.enable_interning()
+    first, second = _method("first"), _method("second")
+    # pylint: disable=protected-access
+    assert first._decorators[0] is second._decorators[0]
+    assert first._docs[0] is second._docs[0]
+    assert first._return_value is second._return_value
+    assert all(a is b for a, b in zip(first._arguments, second._arguments))
+    assert all(a is b for a, b in zip(first._lines, second._lines))
+    info = interning.interning_info()
+    assert info is not None and info.requests == 2 * info.unique
+    assert info.ratio == 2.0 and info.saved > 0
+
+
+def test_imports():
+    interning.enable_interning()
+    first = File(header=None).add_import("os").add_specific_import("typing", "List")
+    second = File(header=None).add_import("os").add_specific_import("typing", "List")
+    # pylint: disable=protected-access
+    assert all(
+        any(import_ is other for other in second._imports) for import_ in first._imports
+    )
+
+
+def test_same_syntax():
+    expected = examples.file.get_example().syntax()
+    interning.enable_interning()
+    assert examples.file.get_example().syntax() == expected
+    class_ = Class("Client", metaclass="ABCMeta", inherit=("Base",))
+    assert class_.syntax() == "class Client(Base,metaclass=ABCMeta):\n"
+
+
+def test_empty_pool():
+    pool = interning.enable_interning()
+    assert pool.info() == (0, 0, 0) and pool.info().ratio == 1.0
+    # Empty collections are kept as is
+    arguments: list = []
+    assert interning.intern_all(arguments) is arguments
@@ -0,0 +1,146 @@
+# pylint: disable=missing-function-docstring
+import json
+import os
+import stat
+
+import pytest
+
+from codemate import File, Package
+from codemate.exceptions import InputError, PackageSaveError
+from tests import examples
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def _get_package() -> Package:
+    package = Package()
+    package.add_file("client.py", examples.file.get_example())
+    package.add_file("api/v1/models.py", File(header="Models"))
+    package.add_file("api/__init__.py", File(header="API"))
+    return package
+
+
+def test_files():
+    package = _get_package()
+    assert list(package.files) == [
+        "__init__.py",
+        "api/__init__.py",
+        "api/v1/__init__.py",
+        "api/v1/models.py",
+        "client.py",
+    ]
+    assert package.get_file("api/__init__.py").syntax() == '"""\nAPI\n"""\n'
+    assert package.get_file("./api/v1/__init__.py").syntax() == ""
+    with pytest.raises(KeyError):
+        package.get_file("api/v2/__init__.py")
+    # The created files are kept, so their changes are saved
+    package.get_file("api/v1/__init__.py").add_import("os")
+    package.add_file("api/v1/users.py", File(header=None))
+    assert "import os" in package.files["api/v1/__init__.py"].syntax()
+    for path in ("/client.py", "../client.py", "api/../../client.py"):
+        with pytest.raises(ValueError):
+            package.add_file(path, File())
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+@pytest.mark.parametrize("use_black", (True, False))
+def test_save(tmp_path, jobs, use_black):
+    package = _get_package()
+    package.get_file("api/v1/__init__.py").add_doc_line("Version 1")
+    package.save(str(tmp_path), use_black=use_black, jobs=jobs)
+    for path, file in package.files.items():
+        expected = file.use_black() if use_black else file.syntax()
+        assert _read(os.path.join(str(tmp_path), path)) == expected
+    init = _read(os.path.join(str(tmp_path), "api", "v1", "__init__.py"))
+    assert init == '"""\nVersion 1\n"""\n'
+    assert _read(os.path.join(str(tmp_path), "client.py")) == (
+        examples.file.get_syntax()
+        if use_black
+        else examples.file.get_example().syntax()
+    )
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_save_errors(tmp_path, jobs):
+    package = _get_package()
+    invalid = File(header=None)
+    invalid.add_syntax_line("x = [")
+    package.add_file("api/invalid.py", invalid)
+    # A directory in the path of a file
+    os.makedirs(os.path.join(str(tmp_path), "client.py"))
+    with pytest.raises(PackageSaveError) as error:
+        package.save(str(tmp_path), jobs=jobs)
+    assert sorted(error.value.errors) == ["api/invalid.py", "client.py"]
+    assert isinstance(error.value.errors["api/invalid.py"], InputError)
+    assert isinstance(error.value.errors["client.py"], OSError)
+    assert os.path.exists(os.path.join(str(tmp_path), "api", "v1", "models.py"))
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_save_incremental(tmp_path, jobs):
+    root = str(tmp_path)
+    package = _get_package()
+    assert len(package.save(root, jobs=jobs, incremental=True)) == 5
+    models = os.path.join(root, "api", "v1", "models.py")
+    mtime = os.stat(models).st_mtime_ns
+    assert package.save(root, jobs=jobs, incremental=True) == []
+    assert os.stat(models).st_mtime_ns == mtime
+    package.add_file("api/v1/models.py", File(header="Changed models"))
+    assert package.save(root, jobs=jobs, incremental=True) == ["api/v1/models.py"]
+    assert _read(models) == '"""\nChanged models\n"""\n'
+    # A file that was changed outside the package is written again
+    with open(models, "w", encoding="utf-8") as file:
+        file.write("x = 1\n")
+    assert package.save(root, jobs=jobs, incremental=True) == ["api/v1/models.py"]
+    assert _read(models) == '"""\nChanged models\n"""\n'
+
+
+def test_save_removes_stale(tmp_path):
+    root = str(tmp_path)
+    package = _get_package()
+    package.save(root, use_black=False, incremental=True)
+    with open(os.path.join(root, "notes.txt"), "w", encoding="utf-8") as file:
+        file.write("Not generated")
+    package = Package()
+    package.add_file("client.py", examples.file.get_example())
+    assert package.save(root, use_black=False, incremental=True) == []
+    assert sorted(os.listdir(root)) == [
+        ".codemate-manifest.json",
+        "__init__.py",
+        "api",
+        "client.py",
+        "notes.txt",
+    ]
+    assert os.listdir(os.path.join(root, "api", "v1")) == []
+
+
+def test_save_keeps_files_outside_root(tmp_path):
+    root = os.path.join(str(tmp_path), "package")
+    outside = os.path.join(str(tmp_path), "outside.py")
+    with open(outside, "w", encoding="utf-8") as file:
+        file.write("x = 1\n")
+    package = Package().add_file("client.py", examples.file.get_example())
+    package.save(root, use_black=False, incremental=True)
+    entry = {"sha256": "", "size": 0, "mtime_ns": 0}
+    paths = ("../outside.py", outside, "api/../client.py", "./client.py")
+    with open(
+        os.path.join(root, ".codemate-manifest.json"), "w", encoding="utf-8"
+    ) as file:
+        json.dump({"files": {path: entry for path in paths}}, file)
+    Package().save(root, use_black=False, incremental=True)
+    assert os.path.exists(outside) and os.path.exists(os.path.join(root, "client.py"))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="The umask is a POSIX feature")
+def test_save_permissions(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        _get_package().save(str(tmp_path), use_black=False, incremental=True)
+    finally:
+        os.umask(umask)
+    for name in ("client.py", ".codemate-manifest.json"):
+        mode = os.stat(os.path.join(str(tmp_path), name)).st_mode
+        assert stat.S_IMODE(mode) == 0o640
@@ -0,0 +1,80 @@
+# pylint: disable=missing-function-docstring
+import ast
+import os
+
+import black
+import pytest
+
+from codemate import Block, File, formatter
+from codemate.exceptions import InputError
+from codemate.pipeline import STAGES, Pipeline
+from tests import examples
+
+
+@pytest.fixture(name="parses")
+def fixture_parses(monkeypatch):
+    calls = []
+    parse = ast.parse
+
+    def counting_parse(source, *args, **kwargs):
+        calls.append(source)
+        return parse(source, *args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+    return calls
+
+
+@pytest.fixture(name="renders")
+def fixture_renders(monkeypatch):
+    calls = []
+    render = Block._render  # pylint: disable=protected-access
+
+    def counting_render(self, *args):
+        calls.append(self)
+        render(self, *args)
+
+    monkeypatch.setattr(Block, "_render", counting_render)
+    return calls
+
+
+@pytest.mark.parametrize("cache", (True, False))
+def test_single_pass(tmp_path, parses, renders, cache):
+    if cache:
+        formatter.enable_cache(use_disk=False)
+    try:
+        file = examples.file.get_example()
+        pipeline = Pipeline(file)
+        assert pipeline.validate()
+        assert pipeline.save(str(tmp_path / "generated.py"))
+    finally:
+        formatter.disable_cache()
+    assert len(renders) == 1
+    assert len(parses) == 1
+    assert list(pipeline.timings) == list(STAGES)
+    with open(str(tmp_path / "generated.py"), encoding="utf-8") as saved:
+        assert saved.read() == examples.file.get_syntax()
+
+
+def test_save_without_black(tmp_path):
+    path = str(tmp_path / "generated.py")
+    file = examples.file.get_example()
+    pipeline = Pipeline(file)
+    assert pipeline.save(path, use_black=False)
+    assert list(pipeline.timings) == ["write"]
+    assert pipeline.save(path, use_black=False, incremental=True) is False
+    assert list(pipeline.timings) == ["write", "render"]
+    with open(path, encoding="utf-8") as saved:
+        assert saved.read() == file.syntax()
+    assert os.listdir(str(tmp_path)) == ["generated.py"]
+
+
+def test_invalid_syntax(tmp_path):
+    file = File(header=None)
+    file.add_syntax_line("x = [")
+    pipeline = Pipeline(file)
+    assert not pipeline.validate(raise_error=False)
+    with pytest.raises(InputError):
+        pipeline.validate()
+    with pytest.raises(black.InvalidInput):
+        pipeline.save(str(tmp_path / "generated.py"))
+    assert not os.listdir(str(tmp_path))
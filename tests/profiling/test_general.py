@@ -0,0 +1,48 @@
+# pylint: disable=missing-function-docstring
+import os
+
+from codemate import Block, File, profiling
+from tests import examples
+
+
+def test_profile(tmp_path):
+    path = str(tmp_path / "generated.py")
+    with profiling.profile() as profile:
+        file = examples.file.get_example()
+        file.add_syntax_line("x = 1")
+        file.validate()
+        file.use_black()
+        file.save(path)
+    stats = profile.as_dict()
+    assert set(stats) == set(profiling.PHASES)
+    assert stats["save"]["calls"] == 1
+    assert stats["save"]["bytes"] == os.path.getsize(path)
+    size = len(file.syntax().encode("utf-8"))
+    assert stats["syntax"]["bytes"] == size * stats["syntax"]["calls"]
+    assert stats["parse_block"]["calls"] >= 1
+    assert stats["format"]["calls"] == 2
+    assert stats["use_black"]["bytes"] == stats["save"]["bytes"]
+    report = profile.report()
+    assert report.split("\n", maxsplit=1)[0].split() == [
+        "phase",
+        "calls",
+        "seconds",
+        "bytes",
+    ]
+    assert all(phase in report for phase in profiling.PHASES)
+
+
+def test_disabled():
+    originals = {name: vars(owner)[name] for owner, name in profiling.PHASES.values()}
+    with profiling.profile() as outer:
+        assert vars(Block)["syntax"] is not originals["syntax"]
+        with profiling.profile() as inner:
+            Block().syntax()
+        Block().syntax()
+    Block().syntax()
+    assert {name: vars(owner)[name] for owner, name in profiling.PHASES.values()} == (
+        originals
+    )
+    assert inner.as_dict()["syntax"]["calls"] == 1
+    assert outer.as_dict()["syntax"]["calls"] == 2
+    assert File.save.__module__ == "codemate.file"
@@ -0,0 +1,52 @@
+# pylint: disable=missing-function-docstring
+import pickle
+import subprocess
+import sys
+from typing import Dict
+
+import black
+import pytest
+
+from codemate import Block, exceptions
+
+# The budget of `import codemate` in microseconds, importing Black alone exceeds it
+IMPORT_BUDGET = 150_000
+
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """
+    Returns the cumulative import time of each module that a statement imports, as
+    reported by `python -X importtime` in a new interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_lazy_modules():
+    times = _import_times("import codemate")
+    imported = {name for name in times if name.split(".")[0] in ("black", "isort")}
+    imported.update(name for name in times if name.startswith("concurrent.futures"))
+    assert not imported
+    assert times["codemate"] < IMPORT_BUDGET
+
+
+def test_input_error():
+    assert issubclass(exceptions.InputError, black.InvalidInput)
+    assert pickle.loads(pickle.dumps(exceptions.InputError)) is exceptions.InputError
+    block = Block()
+    block.add_syntax_line("x = [")
+    with pytest.raises(black.InvalidInput):
+        block.validate()
+    with pytest.raises(AttributeError):
+        getattr(exceptions, "MissingError")
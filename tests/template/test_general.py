@@ -0,0 +1,169 @@
+# pylint: disable=missing-function-docstring
+import ast
+import pickle
+
+import pytest
+
+from codemate import Class, File, Method, Template
+
+
+def _method(name: str, type_: str, path: str) -> Method:
+    method = Method(f"get_{name}", arguments=("item_id: str",), return_value=type_)
+    method.add_decorator("timer")
+    method.add_doc_line(f"GET /{path}/{{item_id}}")
+    method.add_import("json")
+    method.add_syntax_line(f'response = self._get(f"/{path}/{{item_id}}")')
+    method.add_syntax_line(f"return {type_}(**json.loads(response))")
+    return method
+
+
+def _template() -> Template:
+    return Template(_method("$name", "${type}", "${name}s"))
+
+
+def _client(*methods: Method, lazy: bool = True) -> File:
+    class_ = Class("Client")
+    for method in methods:
+        class_.insert(method, lazy=lazy)
+    file = File(header=None)
+    file.insert(class_, lazy=True)
+    return file
+
+
+def test_parameters():
+    template = _template()
+    assert template.parameters == ("name", "type")
+    with pytest.raises(KeyError):
+        template.instantiate(name="user")
+    with pytest.raises(ValueError):
+        Template(Method("get").add_specific_import("models", "$type"))
+
+
+def test_same_syntax():
+    template = _template()
+    instance = template.instantiate(name="user", type="User")
+    expected = _method("user", "User", "users")
+    for indent in (0, 1):
+        for imports in (True, False):
+            assert instance.syntax(indent, imports) == expected.syntax(indent, imports)
+    assert "".join(instance.iter_syntax()) == expected.syntax()
+    for lazy in (True, False):
+        instances = [
+            template.instantiate(name=name, type=name.title())
+            for name in ("user", "group")
+        ]
+        expected_client = _client(
+            _method("user", "User", "users"), _method("group", "Group", "groups")
+        )
+        client = _client(*instances, lazy=lazy)
+        assert client.syntax() == expected_client.syntax()
+        assert client.validate()
+        assert ast.dump(client.tree()) == ast.dump(expected_client.tree())
+
+
+def test_dollar_signs():
+    method = Method("match").add_syntax_line('return re.match(r"^\\d+$", "$$$value")')
+    instance = Template(method).instantiate(value="{x}")
+    assert (
+        instance.syntax()
+        == 'def match(self):\n    return re.match(r"^\\d+$", "${x}")\n'
+    )
+
+
+def test_structure():
+    template = _template()
+    instance = template.instantiate(name="user", type="User")
+    client = _client(instance)
+    class_ = client.get_structure("Client")
+    assert (
+        class_.has_structure("get_user")
+        and class_.get_structure("get_user") is instance
+    )
+    with pytest.raises(ValueError):
+        class_.insert(
+            template.instantiate(name="user", type="Other"), lazy=True, unique=True
+        )
+    assert "def get_user(self, item_id: str) -> User:" in client
+    assert 'self._get(f"/users/{item_id}")' in client and "Group" not in client
+    assert instance == _template().instantiate(name="user", type="User")
+    assert instance != template.instantiate(name="user", type="Other")
+    assert client.syntax() == _client(_method("user", "User", "users")).syntax()
+
+
+def test_immutable():
+    instance = _template().instantiate(name="user", type="User")
+    syntax = instance.syntax()
+    other = Method("other")
+    changes = (
+        lambda: instance.add_syntax_line("pass"),
+        lambda: instance.add_variable("x", value="1"),
+        lambda: instance.add_doc_line("Other"),
+        lambda: instance.add_import("os"),
+        lambda: instance.add_specific_import("os", "path"),
+        lambda: instance.set_import_sorter("native"),
+        lambda: instance.add_decorator("staticmethod"),
+        lambda: instance.insert(other, lazy=True),
+        lambda: instance.insert(other),
+        lambda: instance.extend(File(header=None).add_import("os")),
+        lambda: instance.replace_structure(other),
+        lambda: instance.remove_structure("other"),
+    )
+    for change in changes:
+        with pytest.raises(TypeError):
+            change()
+    # pylint: disable=protected-access
+    assert instance._lines == instance._docs == instance._decorators == ()
+    assert instance._imports == {"import json"} and instance._import_sorter is None
+    assert not other._parents and instance.syntax() == syntax
+
+
+def test_clone():
+    instance = _template().instantiate(name="user", type="User")
+    clone = instance.clone(name="group", type="Group")
+    assert clone.syntax() == _method("group", "Group", "groups").syntax()
+    assert instance.syntax() == _method("user", "User", "users").syntax()
+    with pytest.raises(TypeError):
+        instance.clone(return_value="Other")
+
+
+def test_snapshot():
+    method = _method("$name", "User", "users")
+    template = Template(method)
+    method.add_syntax_line("unreachable = True")
+    assert "unreachable" not in template.instantiate(name="user").syntax()
+
+
+def test_lazy_snapshot():
+    class_ = Class("${name}Client")
+    method = _method("$name", "$type", "${name}s")
+    class_.insert(method, lazy=True)
+    template = Template(class_)
+    # The changes of the lazily inserted blocks don't change the compiled syntax, nor
+    # the syntax that is compiled later for other indentations
+    method.add_import("os").add_syntax_line("unreachable = True")
+    instance = template.instantiate(name="user", type="User")
+    expected = Class("userClient").insert(_method("user", "User", "users"))
+    for indent in (0, 1, 2):
+        assert instance.syntax(indent) == expected.syntax(indent)
+    file = File(header=None).insert(instance, lazy=True)
+    assert "unreachable" not in file and "import os" not in file.syntax()
+    # The method stays in the class only
+    parents = method._parents.values()  # pylint: disable=protected-access
+    assert [parent() for parent in parents] == [class_]
+
+
+def test_class_template():
+    class_ = Class("${name}Client", inherit=("BaseClient",))
+    class_.insert(_method("$name", "$type", "${name}s"), lazy=True)
+    instance = Template(class_).instantiate(name="user", type="User")
+    expected = Class("userClient", inherit=("BaseClient",))
+    expected.insert(_method("user", "User", "users"), lazy=True)
+    file = File(header=None).insert(instance, lazy=True)
+    assert file.syntax() == File(header=None).insert(expected, lazy=True).syntax()
+    assert file.has_structure("userClient")
+
+
+def test_pickle():
+    instance = _template().instantiate(name="user", type="User")
+    client = pickle.loads(pickle.dumps(_client(instance)))
+    assert client.syntax() == _client(_method("user", "User", "users")).syntax()